@@ -1,159 +1,271 @@
 import asyncio
-import json
-import random
+import logging
 import time
 from typing import Callable
 from spade.agent import Agent
 from spade.behaviour import CyclicBehaviour
 from spade.message import Message
+from codec import CONTENT_TYPE_JSON, decode, encode
+from delta import DeltaEncoder, DeltaView
+from policy import GladiatorPlanner
+from transport import TRANSPORT_LOCAL, TRANSPORT_XMPP, LocalAgent, LocalCyclicBehaviour, LocalMessage
 
-# DEFINIRANJE CENTRALNOG KOMUNIKACIJSKOG AGENTA
-class ArenaAgent(Agent):
-    def __init__(self, jid: str, password: str, intents: dict, state_fn: Callable[[], dict], interval: float = 0.5):
-        super().__init__(jid, password)
-        self.intents = intents
-        self.state_fn = state_fn
-        self.interval = interval
-
-    async def setup(self):
-        self.add_behaviour(self.PushState(self.state_fn, self.interval))
-        self.add_behaviour(self.ReceiveIntent(self.intents))
-
-    # SLANJE STANJA SIMULACIJE AGENTIMA
-    class PushState(CyclicBehaviour):
-        def __init__(self, state_fn: Callable[[], dict], interval: float):
-            super().__init__()
+logger = logging.getLogger(__name__)
+
+# TRAJANJE SLANJA STANJA (KODIRANJE, SLANJE, UKUPNO) PO CIKLUSU
+class PushStats:
+    def __init__(self):
+        self.pushes = 0
+        self.messages = 0
+        self.bytes = 0
+        self.encode_time = 0.0
+        self.send_time = 0.0
+        self.total_time = 0.0
+        self.max_total = 0.0
+        self.last: dict = {}
+
+    def record(self, recipients: int, size: int, encode: float, send: float, total: float) -> None:
+        self.pushes += 1
+        self.messages += recipients
+        self.bytes += size * recipients
+        self.encode_time += encode
+        self.send_time += send
+        self.total_time += total
+        self.max_total = max(self.max_total, total)
+        self.last = {"recipients": recipients, "bytes": size, "encode": encode, "send": send, "total": total}
+
+    def stats(self) -> dict:
+        pushes = max(1, self.pushes)
+        return {
+            "pushes": self.pushes,
+            "messages": self.messages,
+            "bytes": self.bytes,
+            "avg_encode": self.encode_time / pushes,
+            "avg_send": self.send_time / pushes,
+            "avg_total": self.total_time / pushes,
+            "max_total": self.max_total,
+            "last": self.last,
+        }
+
+# KLASE AGENATA NAD ZADANIM PRIJENOSOM (SPADE/XMPP ILI LOKALNA SABIRNICA)
+def build_agent_classes(agent_base: type, behaviour_base: type, message_cls: type) -> tuple[type, type]:
+    # DEFINIRANJE CENTRALNOG KOMUNIKACIJSKOG AGENTA
+    class ArenaAgent(agent_base):
+        def __init__(
+            self,
+            jid: str,
+            password: str,
+            intents: dict,
+            state_fn: Callable[[], dict],
+            interval: float = 0.5,
+            now_fn: Callable[[], float] = time.time,
+            delta: bool = False,
+            keyframe_interval: int = 10,
+            views_fn: Callable[[], dict[str, dict]] | None = None,
+            content_type: str = CONTENT_TYPE_JSON,
+        ):
+            super().__init__(jid, password)
+            self.content_type = content_type
+            self.intents = intents
             self.state_fn = state_fn
+            self.views_fn = views_fn
             self.interval = interval
+            self.now_fn = now_fn
+            self.push_stats = PushStats()
+            self.encoder = DeltaEncoder(keyframe_interval) if delta else None
 
-        async def run(self):
-            await asyncio.sleep(self.interval)
-            state = self.state_fn()
-            gladiators = state.get("gladiators", [])
-            for g in gladiators:
-                msg = Message(to=g["jid"])
-                msg.body = json.dumps(state)
-                await self.send(msg)
-
-    # PRIMANJE PORUKA AGENATA
-    class ReceiveIntent(CyclicBehaviour):
-        def __init__(self, intents: dict):
-            super().__init__()
-            self.intents = intents
+        async def setup(self):
+            self.add_behaviour(
+                self.PushState(self.state_fn, self.interval, self.push_stats, self.encoder, self.views_fn, self.content_type)
+            )
+            self.add_behaviour(self.ReceiveIntent(self.intents, self.now_fn, self.encoder))
 
-        async def run(self):
-            msg = await self.receive(timeout=0.1)
-            if msg:
+        # SLANJE STANJA SIMULACIJE AGENTIMA
+        class PushState(behaviour_base):
+            def __init__(
+                self,
+                state_fn: Callable[[], dict],
+                interval: float,
+                stats: PushStats,
+                encoder: DeltaEncoder | None = None,
+                views_fn: Callable[[], dict[str, dict]] | None = None,
+                content_type: str = CONTENT_TYPE_JSON,
+            ):
+                super().__init__()
+                self.state_fn = state_fn
+                self.interval = interval
+                self.stats = stats
+                self.encoder = encoder
+                self.views_fn = views_fn
+                self.content_type = content_type
+
+            # (JID, VRSTA SADRŽAJA, TIJELO) ZA SVAKOG PRIMATELJA
+            def encode(self) -> list[tuple[str, str, str]]:
+                if self.views_fn is not None:
+                    # PRVI GLADIJATOR U POGLEDU JE PRIMATELJ
+                    views = self.views_fn()
+                    payloads = self.encoder.push_views(views) if self.encoder is not None else views
+                    return [
+                        (view["gladiators"][0]["jid"], *encode(payloads[name], self.content_type))
+                        for name, view in views.items()
+                    ]
+                state = self.state_fn()
+                gladiators = state.get("gladiators", [])
+                if self.encoder is None:
+                    encoded = encode(state, self.content_type)
+                    return [(g["jid"], *encoded) for g in gladiators]
+                # JEDNO KODIRANJE PO POTVRĐENOJ BAZI, NE PO PRIMATELJU
+                payloads, bases = self.encoder.push(state, [g["name"] for g in gladiators])
+                encoded_by_base = {base: encode(payload, self.content_type) for base, payload in payloads.items()}
+                return [(g["jid"], *encoded_by_base[bases[g["name"]]]) for g in gladiators]
+
+            # STANJE SE KODIRA JEDNOM, PORUKE SE ŠALJU ISTODOBNO
+            async def run(self):
+                await asyncio.sleep(self.interval)
+                # GREŠKA JEDNOG SLANJA SE ZAPISUJE, SLJEDEĆE SLANJE IDE PO RASPOREDU
                 try:
-                    data = json.loads(str(msg.body))
-                    name = data.get("name")
-                    if name:
-                        self.intents[name] = {"data": data, "time": time.time()}
+                    await self.push()
                 except Exception:
-                    pass
-
-# DEFINIRANJE AGENTA GLADIJATORA
-class GladiatorAgent(Agent):
-    def __init__(self, jid: str, password: str):
-        super().__init__(jid, password)
-        self.last_offer_time = 0.0
-        self.propose_chance = 0.15
-        self.accept_chance = 0.25
-
-    async def setup(self):
-        self.add_behaviour(self.PlanBehaviour())
-
-    # PONAŠANJA AGENATA
-    class PlanBehaviour(CyclicBehaviour):
-        async def run(self):
-            msg = await self.receive(timeout=1)
-            if not msg:
-                return
-            try:
-                data = json.loads(str(msg.body))
-            except Exception:
-                return
-            me = None
-            enemies = []
-            for g in data.get("gladiators", []):
-                if g.get("jid") == str(self.agent.jid):
-                    me = g
-                else:
-                    enemies.append(g)
-            if not me or not enemies:
-                return
-            negotiating = data.get("negotiating", False)
-            my_pos = me["pos"]
-            my_team = me.get("team")
-
-            if negotiating:
-                offers = data.get("offers", [])
-
-                for off in offers:
-                    if off.get("to") == me["name"]:
-                        if random.random() < self.agent.accept_chance:
-                            intent = {"name": me["name"], "action": "accept", "target": off.get("from")}
-                        else:
-                            intent = {"name": me["name"], "action": "decline", "target": off.get("from")}
-                        reply = Message(to=data.get("arena_jid", "arena@localhost"))
-                        reply.body = json.dumps(intent)
-                        await self.send(reply)
+                    logger.exception("state push failed")
+
+            async def push(self):
+                started = time.perf_counter()
+                outgoing = self.encode()
+                encoded = time.perf_counter()
+                messages = []
+                for jid, content_type, body in outgoing:
+                    msg = message_cls(to=jid)
+                    msg.set_metadata("content-type", content_type)
+                    msg.body = body
+                    messages.append(msg)
+                await asyncio.gather(*(self.send(msg) for msg in messages))
+                finished = time.perf_counter()
+                size = sum(len(body) for _, _, body in outgoing) // max(1, len(outgoing))
+                self.stats.record(len(messages), size, encoded - started, finished - encoded, finished - started)
+
+        # PRIMANJE PORUKA AGENATA
+        class ReceiveIntent(behaviour_base):
+            def __init__(self, intents: dict, now_fn: Callable[[], float], encoder: DeltaEncoder | None = None):
+                super().__init__()
+                self.intents = intents
+                self.now_fn = now_fn
+                self.encoder = encoder
+
+            async def run(self):
+                msg = await self.receive(timeout=0.1)
+                if msg:
+                    try:
+                        data = decode(str(msg.body), msg.get_metadata("content-type"))
+                        name = data.get("name")
+                        if not name:
+                            return
+                        # POTVRDA STANJA STIŽE UZ NAMJERU ILI SAMOSTALNO
+                        ack = data.pop("ack", None)
+                        if ack is not None and self.encoder is not None:
+                            self.encoder.ack(name, ack)
+                        if len(data) > 1:
+                            self.intents[name] = {"data": data, "time": self.now_fn()}
+                    except Exception:
+                        pass
+
+    # DEFINIRANJE AGENTA GLADIJATORA
+    class GladiatorAgent(agent_base):
+        def __init__(self, jid: str, password: str):
+            super().__init__(jid, password)
+            self.planner = GladiatorPlanner(jid)
+            self.view = DeltaView()
+
+        async def setup(self):
+            self.add_behaviour(self.PlanBehaviour())
+
+        # PONAŠANJA AGENATA
+        class PlanBehaviour(behaviour_base):
+            async def run(self):
+                msg = await self.receive(timeout=1)
+                if not msg:
+                    return
+                # ZAPIS BIRA ARENA (settings.AGENT_MESSAGE_FORMAT); AGENT GA SAMO PONAVLJA U ODGOVORU
+                content_type = msg.get_metadata("content-type") or CONTENT_TYPE_JSON
+                try:
+                    data = decode(str(msg.body), content_type)
+                except Exception:
+                    return
+                ack = None
+                if "kind" in data:
+                    data = self.agent.view.apply(data)
+                    if data is None:
                         return
+                    ack = self.agent.view.seq
+                intent = self.agent.planner.plan(data, time.time())
+                if intent is None:
+                    if ack is None:
+                        return
+                    me = next((g for g in data.get("gladiators", []) if g.get("jid") == self.agent.planner.jid), None)
+                    if me is None:
+                        return
+                    intent = {"name": me["name"]}
+                if ack is not None:
+                    intent["ack"] = ack
+                reply = message_cls(to=data.get("arena_jid", "arena@localhost"))
+                content_type, reply.body = encode(intent, content_type)
+                reply.set_metadata("content-type", content_type)
+                await self.send(reply)
+
+    return ArenaAgent, GladiatorAgent
+
+
+AGENT_CLASSES = {
+    TRANSPORT_XMPP: build_agent_classes(Agent, CyclicBehaviour, Message),
+    TRANSPORT_LOCAL: build_agent_classes(LocalAgent, LocalCyclicBehaviour, LocalMessage),
+}
+ArenaAgent, GladiatorAgent = AGENT_CLASSES[TRANSPORT_XMPP]
 
-                if (
-                    time.time() - getattr(self.agent, "last_offer_time", 0.0) > 1.0
-                    and random.random() < self.agent.propose_chance
-                ):
-
-                    candidates = [e for e in enemies if e.get("alive") and e.get("team") is None]
-                    if candidates:
-                        target = random.choice(candidates)
-                        intent = {"name": me["name"], "action": "offer", "target": target["name"]}
-                        reply = Message(to=data.get("arena_jid", "arena@localhost"))
-                        reply.body = json.dumps(intent)
-                        await self.send(reply)
-                        self.agent.last_offer_time = time.time()
-                return
-
-            filtered_enemies = [
-                e for e in enemies if e.get("alive") and (my_team is None or e.get("team") != my_team)
-            ]
-            if not filtered_enemies:
-                return
-
-            def dist_sq(e):
-                dx = e["pos"][0] - my_pos[0]
-                dy = e["pos"][1] - my_pos[1]
-                return dx * dx + dy * dy
-
-            target = min(filtered_enemies, key=dist_sq)
-            dx = target["pos"][0] - my_pos[0]
-            dy = target["pos"][1] - my_pos[1]
-            attack = (dx * dx + dy * dy) ** 0.5 <= me["weapon_range"]
-            intent = {
-                "name": me["name"],
-                "move": [dx, dy],
-                "attack": attack,
-                "target": target["name"],
-            }
-            reply = Message(to=data.get("arena_jid", "arena@localhost"))
-            reply.body = json.dumps(intent)
-            await self.send(reply)
-
-# POKRETANJE SPADE AGENATA
-async def start_agents(count: int, intents: dict, state_fn: Callable[[], dict]):
-    arena_agent = ArenaAgent("arena@localhost", "gladiator", intents=intents, state_fn=state_fn, interval=0.5)
-    await arena_agent.start()
+# POKRETANJE AGENATA NA ODABRANOM PRIJENOSU
+async def start_agents(
+    count: int,
+    intents: dict,
+    state_fn: Callable[[], dict],
+    now_fn: Callable[[], float] = time.time,
+    delta: bool = False,
+    keyframe_interval: int = 10,
+    views_fn: Callable[[], dict[str, dict]] | None = None,
+    content_type: str = CONTENT_TYPE_JSON,
+    transport: str = TRANSPORT_XMPP,
+):
+    arena_cls, gladiator_cls = AGENT_CLASSES[transport]
+    arena_agent = arena_cls(
+        "arena@localhost",
+        "gladiator",
+        intents=intents,
+        state_fn=state_fn,
+        interval=0.5,
+        now_fn=now_fn,
+        delta=delta,
+        keyframe_interval=keyframe_interval,
+        views_fn=views_fn,
+        content_type=content_type,
+    )
+    started = None
     gladiators = []
-    for idx in range(count):
-        jid = f"g{idx + 1}@localhost"
-        agent = GladiatorAgent(jid, "gladiator")
-        await agent.start()
-        gladiators.append(agent)
+    try:
+        await arena_agent.start()
+        started = arena_agent
+        for idx in range(count):
+            jid = f"g{idx + 1}@localhost"
+            agent = gladiator_cls(jid, "gladiator")
+            await agent.start()
+            gladiators.append(agent)
+    except Exception:
+        # DJELOMIČNO POKRENUTI AGENTI SE GASE PRIJE POKUŠAJA NA DRUGOM PRIJENOSU
+        try:
+            await stop_agents(started, gladiators)
+        except Exception:
+            pass
+        raise
     return arena_agent, gladiators
 
-# GAŠENJE SPADE AGENATA
-async def stop_agents(arena_agent: Agent | None, gladiators: list[Agent]):
+# GAŠENJE AGENATA
+async def stop_agents(arena_agent: Agent | LocalAgent | None, gladiators: list[Agent | LocalAgent]):
     if arena_agent:
         await arena_agent.stop()
     for agent in gladiators:
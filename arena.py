@@ -3,6 +3,7 @@ import random
 import pygame
 import settings
 from entities import Gladiator, Weapon
+from simclock import SimClock
 
 # DEFINIRANJE RJEČNIKA KLASA
 CLASS_CONFIGS = {
@@ -57,6 +58,16 @@ def draw_arena(
     surface.blit(sand_texture, (0, 0))
     surface.blit(wall_texture, (0, 0))
 
+# STATIČNI SLOJ ARENE (KAMEN, PIJESAK I ZID) U JEDNOJ POVRŠINI
+def compose_arena_layer(
+    bg_surface: pygame.Surface,
+    wall_texture: pygame.Surface,
+    sand_texture: pygame.Surface,
+) -> pygame.Surface:
+    layer = bg_surface.copy()
+    draw_arena(layer, wall_texture, sand_texture)
+    return layer
+
 # KREIRANJE TEKSTURE ZIDA
 def build_wall_texture(
     texture: pygame.Surface,
@@ -109,7 +120,13 @@ def build_sand_texture(texture: pygame.Surface, size: tuple[int, int], scale: fl
     return tiled
 
 # POSTAVLJANJE GLADIJATORA UNUTAR ARENE
-def spawn_gladiators(count: int, class_list: list[str] | None = None) -> list[Gladiator]:
+def spawn_gladiators(
+    count: int,
+    class_list: list[str] | None = None,
+    rng: random.Random | None = None,
+    clock: SimClock | None = None,
+) -> list[Gladiator]:
+    rng = rng if rng is not None else random.Random()
     gladiators: list[Gladiator] = []
     edge_radius = settings.ARENA_RADIUS - 60
     for idx in range(count):
@@ -118,8 +135,8 @@ def spawn_gladiators(count: int, class_list: list[str] | None = None) -> list[Gl
         if class_list and idx < len(class_list):
             class_name = class_list[idx]
         else:
-            class_name = random.choice(list(CLASS_CONFIGS.keys()))
-        cfg = CLASS_CONFIGS.get(class_name, random.choice(list(CLASS_CONFIGS.values())))
+            class_name = rng.choice(list(CLASS_CONFIGS.keys()))
+        cfg = CLASS_CONFIGS.get(class_name) or rng.choice(list(CLASS_CONFIGS.values()))
         gladiators.append(
             Gladiator(
                 name=f"G{idx + 1}",
@@ -129,14 +146,18 @@ def spawn_gladiators(count: int, class_list: list[str] | None = None) -> list[Gl
                 armor=cfg["armor"],
                 speed=cfg["speed"],
                 weapon=cfg["weapon"],
+                rng=rng,
+                clock=clock,
             )
         )
     return gladiators
 
 # CRTANJE LINIJA PREGOVORA IZMEĐU AGENATA
-def draw_offer_lines(surface: pygame.Surface, offer_visuals: list, gladiators: list[Gladiator]) -> None:
+def draw_offer_lines(surface: pygame.Surface, offer_visuals: list, living: dict[str, Gladiator]) -> list[pygame.Rect]:
+    dirty = []
     for v in offer_visuals:
-        frm = next((g for g in gladiators if g.name == v["from"]), None)
-        to = next((g for g in gladiators if g.name == v["to"]), None)
-        if frm and to and frm.alive and to.alive:
-            pygame.draw.line(surface, v["color"], frm.position, to.position, width=3)
\ No newline at end of file
+        frm = living.get(v["from"])
+        to = living.get(v["to"])
+        if frm and to:
+            dirty.append(pygame.draw.line(surface, v["color"], frm.position, to.position, width=3))
+    return dirty
\ No newline at end of file
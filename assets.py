@@ -0,0 +1,174 @@
+import hashlib
+import os
+import struct
+import threading
+from typing import Callable
+import pygame
+
+ASSET_CACHE_DIR = os.path.join(".cache", "assets")
+ASSET_CACHE_MAX_BYTES = 64 * 1024 * 1024
+ASSET_CACHE_MAX_FILES = 48
+
+# SIVA VARIJANTA TEKSTURE ZA MRTVE GLADIJATORE
+def make_grayscale(surface: pygame.Surface) -> pygame.Surface:
+    gray = surface.copy()
+    try:
+        arr = pygame.surfarray.pixels3d(gray)
+        lum = (0.299 * arr[:, :, 0] + 0.587 * arr[:, :, 1] + 0.114 * arr[:, :, 2]).astype(arr.dtype)
+        arr[:, :, 0] = lum
+        arr[:, :, 1] = lum
+        arr[:, :, 2] = lum
+        del arr
+        gray.fill((80, 80, 80, 255), special_flags=pygame.BLEND_RGBA_MULT)
+    except Exception:
+        gray.fill((70, 70, 70, 255), special_flags=pygame.BLEND_RGBA_MULT)
+    return gray
+
+# DEKODIRANE I IZVEDENE POVRŠINE U MEMORIJI I NA DISKU
+class AssetManager:
+    def __init__(
+        self,
+        cache_dir: str | None = ASSET_CACHE_DIR,
+        max_bytes: int = ASSET_CACHE_MAX_BYTES,
+        max_files: int = ASSET_CACHE_MAX_FILES,
+    ):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self.surfaces: dict[tuple, pygame.Surface] = {}
+        self.hashes: dict[str, str] = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def source_hash(self, path: str) -> str:
+        digest = self.hashes.get(path)
+        if digest is None:
+            with open(path, "rb") as source:
+                digest = hashlib.sha1(source.read()).hexdigest()
+            self.hashes[path] = digest
+        return digest
+
+    def image(self, path: str, alpha: bool = False) -> pygame.Surface:
+        key = ("image", path, alpha)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = pygame.image.load(path)
+            surface = surface.convert_alpha() if alpha else surface.convert()
+            self.surfaces[key] = surface
+        return surface
+
+    # IZVEDENA POVRŠINA S KLJUČEM (NAZIV, HASH IZVORA, PARAMETRI)
+    def derived(
+        self,
+        name: str,
+        sources: list[str],
+        params: tuple,
+        build: Callable[[], pygame.Surface],
+        alpha: bool = False,
+    ) -> pygame.Surface:
+        parts = [name, *(self.source_hash(path) for path in sources), repr(params), str(alpha)]
+        digest = hashlib.sha1("|".join(parts).encode()).hexdigest()[:24]
+        key = ("derived", digest)
+        with self.lock:
+            surface = self.surfaces.get(key)
+        if surface is not None:
+            return surface
+
+        filename = os.path.join(self.cache_dir, f"{name}_{digest}.raw") if self.cache_dir else None
+        surface = self._read(filename, alpha) if filename else None
+        hit = surface is not None
+        if not hit:
+            surface = build()
+            if filename:
+                self._write(filename, surface, alpha)
+                self._prune()
+        # POZADINSKA NIT ZA OBNOVU ARENE POZIVA OVO ISTODOBNO S GLAVNOM
+        with self.lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            self.surfaces[key] = surface
+        return surface
+
+    def scaled(self, path: str, size: tuple[int, int], alpha: bool = False) -> pygame.Surface:
+        return self.derived(
+            "scaled",
+            [path],
+            (size,),
+            lambda: pygame.transform.smoothscale(self.image(path, alpha), size),
+            alpha,
+        )
+
+    def scaled_by(self, path: str, factor: float, alpha: bool = False) -> pygame.Surface:
+        def build() -> pygame.Surface:
+            image = self.image(path, alpha)
+            size = (
+                max(1, int(image.get_width() * factor)),
+                max(1, int(image.get_height() * factor)),
+            )
+            return pygame.transform.smoothscale(image, size)
+
+        return self.derived("scaled_by", [path], (factor,), build, alpha)
+
+    def grayscale(self, path: str, size: tuple[int, int]) -> pygame.Surface:
+        return self.derived(
+            "grayscale",
+            [path],
+            (size,),
+            lambda: make_grayscale(self.scaled(path, size, alpha=True)),
+            alpha=True,
+        )
+
+    # SIROVI PIKSELI: BRŽE OD PONOVNOG DEKODIRANJA PNG-A
+    def _read(self, filename: str, alpha: bool) -> pygame.Surface | None:
+        try:
+            with open(filename, "rb") as cached:
+                width, height = struct.unpack("<II", cached.read(8))
+                data = cached.read()
+            surface = pygame.image.frombytes(data, (width, height), "RGBA" if alpha else "RGB")
+            # VRIJEME IZMJENE SLUŽI KAO VRIJEME ZADNJE UPORABE ZA LRU
+            os.utime(filename)
+        except (OSError, ValueError, struct.error):
+            return None
+        return surface.convert_alpha() if alpha else surface.convert()
+
+    def _write(self, filename: str, surface: pygame.Surface, alpha: bool) -> None:
+        try:
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
+            tmp = f"{filename}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as cached:
+                cached.write(struct.pack("<II", *surface.get_size()))
+                cached.write(pygame.image.tobytes(surface, "RGBA" if alpha else "RGB"))
+            os.replace(tmp, filename)
+        except OSError:
+            pass
+
+    # BRISANJE NAJDULJE NEKORIŠTENIH ZAPISA IZNAD GRANICE BROJA ILI VELIČINE
+    def _prune(self) -> None:
+        try:
+            entries = []
+            with os.scandir(self.cache_dir) as scan:
+                for entry in scan:
+                    if entry.name.endswith(".raw"):
+                        info = entry.stat()
+                        entries.append((info.st_mtime, info.st_size, entry.path))
+        except OSError:
+            return
+        entries.sort(reverse=True)
+        total = 0
+        for index, (_, size, path) in enumerate(entries):
+            total += size
+            if index and (index >= self.max_files or total > self.max_bytes):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def clear_memory(self) -> None:
+        with self.lock:
+            self.surfaces.clear()
+
+
+ASSETS = AssetManager()
@@ -0,0 +1,77 @@
+from __future__ import annotations
+from concurrent.futures import Future, ThreadPoolExecutor
+import pygame
+import settings
+from arena import build_sand_texture, build_wall_texture, compose_arena_layer
+from assets import ASSETS
+
+ROCKS_TEXTURE_PATH = "art/rocks.png"
+
+# DEKODIRANE I SKALIRANE TEKSTURE POZADINE (UČITAVAJU SE SAMO JEDNOM)
+def load_background_images() -> dict[str, pygame.Surface]:
+    return {
+        "rocks": ASSETS.scaled_by(ROCKS_TEXTURE_PATH, 0.5),
+        "wall": ASSETS.scaled_by(settings.WALL_TEXTURE_PATH, settings.WALL_TEXTURE_SCALE),
+        "sand": ASSETS.scaled_by(settings.SAND_TEXTURE_PATH, settings.SAND_TEXTURE_SCALE),
+    }
+
+# SLOJ ARENE ZA POČETNU VELIČINU PROZORA (IZ DISKOVNOG SPREMNIKA AKO POSTOJI)
+def cached_arena_layer(size: tuple[int, int], images: dict[str, pygame.Surface]) -> pygame.Surface:
+    return ASSETS.derived(
+        "arena",
+        [ROCKS_TEXTURE_PATH, settings.WALL_TEXTURE_PATH, settings.SAND_TEXTURE_PATH],
+        (
+            size,
+            (settings.ARENA_CENTER.x, settings.ARENA_CENTER.y),
+            settings.ARENA_RADIUS,
+            settings.WALL_TEXTURE_SCALE,
+            settings.SAND_TEXTURE_SCALE,
+        ),
+        lambda: build_arena_layer(size, images),
+    )
+
+# POSTAVLJANJE TEKSTURA POZADINE I ZIDOVA
+def build_arena_layer(size: tuple[int, int], images: dict[str, pygame.Surface]) -> pygame.Surface:
+    bg_surface = pygame.Surface(size)
+    rocks = images["rocks"]
+    tile_w, tile_h = rocks.get_size()
+    for y in range(0, size[1], tile_h):
+        for x in range(0, size[0], tile_w):
+            bg_surface.blit(rocks, (x, y))
+    wall_texture = build_wall_texture(images["wall"], size)
+    sand_texture = build_sand_texture(images["sand"], size)
+    return compose_arena_layer(bg_surface, wall_texture, sand_texture)
+
+# ODGOĐENA IZGRADNJA POZADINE U POZADINSKOJ DRETVI NAKON PROMJENE VELIČINE
+class BackgroundRebuilder:
+    def __init__(self, images: dict[str, pygame.Surface], delay: float = 0.15):
+        self.images = images
+        self.delay = delay
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.generation = 0
+        self.pending_size: tuple[int, int] | None = None
+        self.pending_since = 0.0
+        self.job: Future | None = None
+        self.job_generation = -1
+
+    def request(self, size: tuple[int, int], now: float) -> None:
+        self.generation += 1
+        self.pending_size = size
+        self.pending_since = now
+
+    # GOTOV SLOJ ZA TRENUTNU GENERACIJU ILI None
+    def poll(self, now: float) -> pygame.Surface | None:
+        if self.pending_size is not None and now - self.pending_since >= self.delay:
+            size = self.pending_size
+            self.pending_size = None
+            self.job_generation = self.generation
+            self.job = self.executor.submit(build_arena_layer, size, self.images)
+        if self.job is None or not self.job.done():
+            return None
+        job, self.job = self.job, None
+        if self.job_generation != self.generation:
+            return None
+        return job.result().convert()
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
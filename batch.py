@@ -0,0 +1,153 @@
+import os
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import csv
+import math
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from arena import CLASS_CONFIGS
+from headless import run_headless
+from settings import FPS, GLADIATOR_COUNT
+
+# JEDAN MEČ U RADNOM PROCESU
+def _run_one(seed: int, class_list: list[str], dt: float, max_time: float) -> dict:
+    return run_headless(len(class_list), class_list, dt=dt, max_time=max_time, seed=seed)
+
+# WILSONOV INTERVAL POUZDANOSTI ZA UDIO POBJEDA
+def wilson_interval(wins: int, total: int, z: float = 1.96) -> tuple[float, float]:
+    if total == 0:
+        return 0.0, 0.0
+    p = wins / total
+    denom = 1 + z * z / total
+    center = (p + z * z / (2 * total)) / denom
+    margin = z * math.sqrt(p * (1 - p) / total + z * z / (4 * total * total)) / denom
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+# ZBIRNA STATISTIKA POBJEDA
+class WinStats:
+    GROUPS = ("class", "team_size", "betrayal")
+
+    def __init__(self):
+        self.matches = 0
+        self.outcomes: Counter = Counter()
+        self.groups: dict[str, dict] = {name: {} for name in self.GROUPS}
+
+    def add(self, result: dict) -> None:
+        self.matches += 1
+        if not result["finished"]:
+            self.outcomes["timeout"] += 1
+        elif result["winner_team"] is not None:
+            self.outcomes["team"] += 1
+        elif result["winner_name"] is not None:
+            self.outcomes["champion"] += 1
+        else:
+            self.outcomes["everyone fell"] += 1
+
+        team_sizes = Counter(row["team"] for row in result["gladiators"] if row["team"] is not None)
+        for row in result["gladiators"]:
+            if row["betrayed_end"]:
+                betrayal = "betrayed at end"
+            elif row["betrayed_opp"]:
+                betrayal = "betrayed mid-fight"
+            else:
+                betrayal = "loyal"
+            keys = {
+                "class": row["class"],
+                "team_size": team_sizes[row["team"]] if row["team"] is not None else 1,
+                "betrayal": betrayal,
+            }
+            for group, key in keys.items():
+                counts = self.groups[group].setdefault(key, [0, 0])
+                counts[0] += 1 if row["won"] else 0
+                counts[1] += 1
+
+    def rows(self) -> list[tuple]:
+        rows = []
+        for group in self.GROUPS:
+            for key in sorted(self.groups[group], key=str):
+                wins, total = self.groups[group][key]
+                low, high = wilson_interval(wins, total)
+                rows.append((group, key, wins, total, wins / total if total else 0.0, low, high))
+        return rows
+
+    def report(self) -> str:
+        lines = [f"{self.matches} matches: " + ", ".join(f"{k} {v}" for k, v in sorted(self.outcomes.items()))]
+        current = None
+        for group, key, wins, total, rate, low, high in self.rows():
+            if group != current:
+                lines.append(f"win rate by {group.replace('_', ' ')}:")
+                current = group
+            lines.append(f"  {str(key):<20} {rate:6.1%}  [{low:6.1%}, {high:6.1%}]  {wins}/{total}")
+        return "\n".join(lines)
+
+# POKRETANJE VIŠE MEČEVA PARALELNO
+def run_batch(
+    matches: int,
+    gladiator_count: int = GLADIATOR_COUNT,
+    workers: int | None = None,
+    seed: int | None = None,
+    dt: float = 1.0 / FPS,
+    max_time: float = 600.0,
+    progress: bool = True,
+) -> WinStats:
+    master = random.Random(seed)
+    class_names = list(CLASS_CONFIGS.keys())
+    stats = WinStats()
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        futures = [
+            pool.submit(
+                _run_one,
+                master.randrange(2**32),
+                [master.choice(class_names) for _ in range(gladiator_count)],
+                dt,
+                max_time,
+            )
+            for _ in range(matches)
+        ]
+        for done, future in enumerate(as_completed(futures), 1):
+            stats.add(future.result())
+            if progress:
+                rate = done / max(1e-9, time.perf_counter() - start)
+                sys.stderr.write(f"\r{done}/{matches} matches  {rate:.1f} matches/s")
+                sys.stderr.flush()
+    if progress:
+        sys.stderr.write("\n")
+    return stats
+
+# IZVOZ ZBIRNIH REZULTATA
+def export_csv(stats: WinStats, filename: str) -> None:
+    with open(filename, "w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(["matches", stats.matches])
+        for outcome, count in sorted(stats.outcomes.items()):
+            writer.writerow([outcome, count])
+        writer.writerow([])
+        writer.writerow(["group", "key", "wins", "total", "win_rate", "ci_low", "ci_high"])
+        for group, key, wins, total, rate, low, high in stats.rows():
+            writer.writerow([group, key, wins, total, f"{rate:.4f}", f"{low:.4f}", f"{high:.4f}"])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run many headless gladiator matches in parallel.")
+    parser.add_argument("matches", type=int)
+    parser.add_argument("--count", type=int, default=GLADIATOR_COUNT)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--dt", type=float, default=1.0 / FPS)
+    parser.add_argument("--max-time", type=float, default=600.0)
+    parser.add_argument("--export", action="store_true", help="write the aggregate to logs/batch_<timestamp>.csv")
+    args = parser.parse_args()
+
+    stats = run_batch(args.matches, args.count, args.workers, args.seed, args.dt, args.max_time)
+    print(stats.report())
+    if args.export:
+        os.makedirs("logs", exist_ok=True)
+        filename = f"logs/batch_{time.strftime('%Y-%m-%d_%H-%M-%S')}.csv"
+        export_csv(stats, filename)
+        print(f'Results exported in "{filename}"')
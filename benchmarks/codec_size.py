@@ -0,0 +1,55 @@
+import os
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import time
+from codec import CONTENT_TYPES, decode, encode
+from delta import diff_state
+from match import Match
+
+def timed(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+# STANJE, RAZLIKA IZMEĐU DVAJU SLANJA I NAMJERA: VELIČINA TIJELA I VRIJEME ZAPISA/ČITANJA
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare JSON and binary arena message encodings.")
+    parser.add_argument("--count", type=int, nargs="+", default=[20, 100, 300])
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--push-ticks", type=int, default=30)
+    args = parser.parse_args()
+
+    print(
+        f"{'agents':>6} {'format':<7} {'state B':>8} {'enc us':>8} {'dec us':>8}"
+        f" {'delta B':>8} {'enc us':>7} {'dec us':>7} {'intent B':>9} {'enc us':>7} {'dec us':>7}"
+    )
+    for count in args.count:
+        match = Match(count, seed=args.seed)
+        match.begin(2.0)
+        for _ in range(300):
+            match.step(1 / 60)
+        base = match.state()
+        for _ in range(args.push_ticks):
+            match.step(1 / 60)
+        state = match.state()
+        delta = {"kind": "delta", "seq": 2, "base": 1, "delta": diff_state(base, state)}
+        intent = {"name": "G1", "move": [123.456789, -98.7654321], "attack": True, "target": "G2", "ack": 42}
+        for content_type in CONTENT_TYPES:
+            _, state_body = encode(state, content_type)
+            _, delta_body = encode(delta, content_type)
+            _, intent_body = encode(intent, content_type)
+            print(
+                f"{count:>6} {content_type.split('/')[1][:7]:<7} {len(state_body):>8}"
+                f" {timed(lambda: encode(state, content_type), args.repeat):>8.1f}"
+                f" {timed(lambda: decode(state_body, content_type), args.repeat):>8.1f}"
+                f" {len(delta_body):>8}"
+                f" {timed(lambda: encode(delta, content_type), args.repeat):>7.1f}"
+                f" {timed(lambda: decode(delta_body, content_type), args.repeat):>7.1f}"
+                f" {len(intent_body):>9}"
+                f" {timed(lambda: encode(intent, content_type), args.repeat * 10):>7.1f}"
+                f" {timed(lambda: decode(intent_body, content_type), args.repeat * 10):>7.1f}"
+            )
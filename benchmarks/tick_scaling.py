@@ -0,0 +1,40 @@
+import os
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import time
+from arena import recalc_arena
+from match import Match
+
+# VRIJEME KORAKA PO ŽIVOM GLADIJATORU ZA RASTUĆI N U ISTOJ ARENI
+def measure_tick_time(count: int, warmup: int = 300, ticks: int = 10, repeat: int = 3, seed: int = 1) -> dict:
+    match = Match(count, seed=seed)
+    match.use_intents = False
+    match.begin(0.0)
+    for _ in range(warmup):
+        match.step(1 / 60)
+    best = float("inf")
+    alive = 0
+    for _ in range(repeat):
+        alive = len(match.registry.living)
+        start = time.perf_counter()
+        for _ in range(ticks):
+            match.step(1 / 60)
+        best = min(best, (time.perf_counter() - start) / ticks)
+    return {"count": count, "alive": alive, "tick": best, "per_gladiator": best / max(1, alive)}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure simulation tick time against the gladiator count.")
+    parser.add_argument("--count", type=int, nargs="+", default=[200, 400, 800, 1600])
+    parser.add_argument("--arena", type=int, default=6000)
+    parser.add_argument("--warmup", type=int, default=300)
+    parser.add_argument("--ticks", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    recalc_arena(args.arena, args.arena)
+    print(f"{'N':>6} {'alive':>6} {'tick ms':>8} {'us/alive':>9}")
+    for count in args.count:
+        row = measure_tick_time(count, args.warmup, args.ticks, args.repeat)
+        print(f"{count:>6} {row['alive']:>6} {row['tick'] * 1e3:>8.1f} {row['per_gladiator'] * 1e6:>9.1f}")
@@ -0,0 +1,388 @@
+from __future__ import annotations
+import base64
+import json
+import struct
+
+CONTENT_TYPE_JSON = "application/json"
+CONTENT_TYPE_BINARY = "application/x-vas-arena;v=1"
+CONTENT_TYPES = (CONTENT_TYPE_JSON, CONTENT_TYPE_BINARY)
+
+MAGIC = b"VA"
+VERSION = 1
+KIND_STATE, KIND_KEYFRAME, KIND_INTENT, KIND_DELTA = 0, 1, 2, 3
+POS_SCALE = 4.0
+ACTIONS = ("offer", "accept", "decline")
+
+HEADER = struct.Struct("<2sBB")
+SEQ = struct.Struct("<I")
+STATE_HEAD = struct.Struct("<BfhhHHHH")
+GLADIATOR = struct.Struct("<hhhHfBB")
+VISUAL = struct.Struct("<BBBf")
+INTENT = struct.Struct("<BBhhI")
+DELTA_HEAD = struct.Struct("<IIBBfHHHH")
+ARENA = struct.Struct("<hhH")
+CHANGE = struct.Struct("<HB")
+POS = struct.Struct("<hh")
+HP = struct.Struct("<h")
+ARMOR = struct.Struct("<H")
+RANGE = struct.Struct("<f")
+COUNT = struct.Struct("<H")
+
+G_ALIVE, G_TEAM, G_JID = 1, 2, 4
+I_ACTION, I_TARGET, I_MOVE, I_ATTACK, I_ACK = 1, 2, 4, 8, 16
+# RAZLIKA: KOJA SU POLJA VRHA PROMIJENJENA (T_*), ZASTAVICE RAZLIKE (D_*) I GLADIJATORA (C_*)
+T_NEGOTIATING, T_TIME_LEFT, T_OFFERS, T_VISUALS, T_ARENA, T_ARENA_JID = 1, 2, 4, 8, 16, 32
+D_ORDER, D_NEGOTIATING = 1, 2
+C_POS, C_HP, C_ARMOR, C_RANGE, C_ALIVE, C_TEAM, C_JID = 1, 2, 4, 8, 16, 32, 64
+C_ALIVE_VALUE, C_TEAM_VALUE = 256, 512
+TOP_FLAGS = {
+    "negotiating": T_NEGOTIATING,
+    "negotiation_time_left": T_TIME_LEFT,
+    "offers": T_OFFERS,
+    "offer_visuals": T_VISUALS,
+    "arena": T_ARENA,
+    "arena_jid": T_ARENA_JID,
+}
+CHANGE_FLAGS = {
+    "pos": C_POS,
+    "hp": C_HP,
+    "armor": C_ARMOR,
+    "weapon_range": C_RANGE,
+    "alive": C_ALIVE,
+    "team": C_TEAM,
+    "jid": C_JID,
+}
+
+# ZAPIS NIZA: DULJINA (u8) + UTF-8
+def _put_str(out: bytearray, text: str) -> None:
+    raw = text.encode()
+    out.append(len(raw))
+    out += raw
+
+def _get_str(data: bytes, offset: int) -> tuple[str, int]:
+    end = offset + 1 + data[offset]
+    return data[offset + 1:end].decode(), end
+
+def _q(value: float) -> int:
+    return max(-32768, min(32767, round(value * POS_SCALE)))
+
+def _jid(name: str) -> str:
+    return f"{name.lower()}@localhost"
+
+# ZAPISI GLADIJATORA, PONUDA I VIZUALA (ZAJEDNIČKI STANJU I RAZLICI)
+def _put_gladiator(out: bytearray, g: dict) -> None:
+    team = g.get("team")
+    custom_jid = g["jid"] != _jid(g["name"])
+    flags = (G_ALIVE if g.get("alive") else 0) | (G_TEAM if team is not None else 0) | (G_JID if custom_jid else 0)
+    out += GLADIATOR.pack(_q(g["pos"][0]), _q(g["pos"][1]), int(g["hp"]), int(g["armor"]), g["weapon_range"], flags, team or 0)
+    _put_str(out, g["name"])
+    if custom_jid:
+        _put_str(out, g["jid"])
+
+def _get_gladiator(data: bytes, offset: int) -> tuple[dict, int]:
+    x, y, hp, armor, weapon_range, flags, team = GLADIATOR.unpack_from(data, offset)
+    name, offset = _get_str(data, offset + GLADIATOR.size)
+    jid = _jid(name)
+    if flags & G_JID:
+        jid, offset = _get_str(data, offset)
+    return {
+        "name": name,
+        "jid": jid,
+        "pos": [x / POS_SCALE, y / POS_SCALE],
+        "hp": hp,
+        "armor": armor,
+        "weapon_range": weapon_range,
+        "alive": bool(flags & G_ALIVE),
+        "team": team if flags & G_TEAM else None,
+    }, offset
+
+def _put_offer(out: bytearray, offer: dict) -> None:
+    _put_str(out, offer["from"])
+    _put_str(out, offer["to"])
+
+def _get_offer(data: bytes, offset: int) -> tuple[dict, int]:
+    frm, offset = _get_str(data, offset)
+    to, offset = _get_str(data, offset)
+    return {"from": frm, "to": to}, offset
+
+def _put_visual(out: bytearray, v: dict) -> None:
+    _put_offer(out, v)
+    out += VISUAL.pack(*v["color"], v["expires"])
+
+def _get_visual(data: bytes, offset: int) -> tuple[dict, int]:
+    v, offset = _get_offer(data, offset)
+    r, g, b, expires = VISUAL.unpack_from(data, offset)
+    v.update(color=[r, g, b], expires=expires)
+    return v, offset + VISUAL.size
+
+# STANJE ARENE: ZAGLAVLJE, ZATIM ZAPISI FIKSNE DULJINE S IMENIMA
+def _pack_state(out: bytearray, state: dict) -> None:
+    gladiators = state.get("gladiators", [])
+    offers = state.get("offers", [])
+    visuals = state.get("offer_visuals", [])
+    arena = state.get("arena", {})
+    center = arena.get("center", [0.0, 0.0])
+    out += STATE_HEAD.pack(
+        1 if state.get("negotiating") else 0,
+        state.get("negotiation_time_left", 0.0),
+        _q(center[0]),
+        _q(center[1]),
+        int(arena.get("radius", 0)),
+        len(gladiators),
+        len(offers),
+        len(visuals),
+    )
+    _put_str(out, state.get("arena_jid", "arena@localhost"))
+    for g in gladiators:
+        _put_gladiator(out, g)
+    for offer in offers:
+        _put_offer(out, offer)
+    for v in visuals:
+        _put_visual(out, v)
+
+def _unpack_state(data: bytes, offset: int) -> dict:
+    negotiating, time_left, cx, cy, radius, count, offer_count, visual_count = STATE_HEAD.unpack_from(data, offset)
+    offset += STATE_HEAD.size
+    arena_jid, offset = _get_str(data, offset)
+    gladiators = []
+    for _ in range(count):
+        g, offset = _get_gladiator(data, offset)
+        gladiators.append(g)
+    offers = []
+    for _ in range(offer_count):
+        offer, offset = _get_offer(data, offset)
+        offers.append(offer)
+    visuals = []
+    for _ in range(visual_count):
+        v, offset = _get_visual(data, offset)
+        visuals.append(v)
+    return {
+        "arena_jid": arena_jid,
+        "negotiating": bool(negotiating),
+        "negotiation_time_left": time_left,
+        "offers": offers,
+        "offer_visuals": visuals,
+        "gladiators": gladiators,
+        "arena": {"center": [cx / POS_SCALE, cy / POS_SCALE], "radius": radius},
+    }
+
+# RAZLIKA: ZAGLAVLJE S BROJAČIMA, PROMIJENJENA POLJA VRHA, ZATIM GLADIJATORI PO IMENU
+# NEPOZNATO POLJE DIŽE KeyError PA SE PORUKA ŠALJE KAO JSON
+def _pack_delta(out: bytearray, seq: int, base: int, delta: dict) -> None:
+    top = delta.get("top", {})
+    changed = delta.get("changed", {})
+    added = delta.get("added", [])
+    removed = delta.get("removed", [])
+    order = delta.get("order")
+    top_flags = 0
+    for key in top:
+        top_flags |= TOP_FLAGS[key]
+    flags = (D_ORDER if order is not None else 0) | (D_NEGOTIATING if top.get("negotiating") else 0)
+    out += DELTA_HEAD.pack(
+        seq,
+        base,
+        top_flags,
+        flags,
+        top.get("negotiation_time_left", 0.0),
+        len(changed),
+        len(added),
+        len(removed),
+        len(order or ()),
+    )
+    if top_flags & T_ARENA:
+        center = top["arena"]["center"]
+        out += ARENA.pack(_q(center[0]), _q(center[1]), int(top["arena"]["radius"]))
+    if top_flags & T_ARENA_JID:
+        _put_str(out, top["arena_jid"])
+    if top_flags & T_OFFERS:
+        out += COUNT.pack(len(top["offers"]))
+        for offer in top["offers"]:
+            _put_offer(out, offer)
+    if top_flags & T_VISUALS:
+        out += COUNT.pack(len(top["offer_visuals"]))
+        for v in top["offer_visuals"]:
+            _put_visual(out, v)
+    for name, fields in changed.items():
+        change = 0
+        for key in fields:
+            change |= CHANGE_FLAGS[key]
+        team = fields.get("team")
+        if fields.get("alive"):
+            change |= C_ALIVE_VALUE
+        if team is not None:
+            change |= C_TEAM_VALUE
+        out += CHANGE.pack(change, team or 0)
+        _put_str(out, name)
+        if change & C_POS:
+            out += POS.pack(_q(fields["pos"][0]), _q(fields["pos"][1]))
+        if change & C_HP:
+            out += HP.pack(int(fields["hp"]))
+        if change & C_ARMOR:
+            out += ARMOR.pack(int(fields["armor"]))
+        if change & C_RANGE:
+            out += RANGE.pack(fields["weapon_range"])
+        if change & C_JID:
+            _put_str(out, fields["jid"])
+    for g in added:
+        _put_gladiator(out, g)
+    for name in removed:
+        _put_str(out, name)
+    for name in order or ():
+        _put_str(out, name)
+
+def _unpack_delta(data: bytes, offset: int) -> dict:
+    seq, base, top_flags, flags, time_left, changed_count, added_count, removed_count, order_count = DELTA_HEAD.unpack_from(data, offset)
+    offset += DELTA_HEAD.size
+    top: dict = {}
+    if top_flags & T_NEGOTIATING:
+        top["negotiating"] = bool(flags & D_NEGOTIATING)
+    if top_flags & T_TIME_LEFT:
+        top["negotiation_time_left"] = time_left
+    if top_flags & T_ARENA:
+        cx, cy, radius = ARENA.unpack_from(data, offset)
+        offset += ARENA.size
+        top["arena"] = {"center": [cx / POS_SCALE, cy / POS_SCALE], "radius": radius}
+    if top_flags & T_ARENA_JID:
+        top["arena_jid"], offset = _get_str(data, offset)
+    if top_flags & T_OFFERS:
+        (count,) = COUNT.unpack_from(data, offset)
+        offset += COUNT.size
+        top["offers"] = []
+        for _ in range(count):
+            offer, offset = _get_offer(data, offset)
+            top["offers"].append(offer)
+    if top_flags & T_VISUALS:
+        (count,) = COUNT.unpack_from(data, offset)
+        offset += COUNT.size
+        top["offer_visuals"] = []
+        for _ in range(count):
+            v, offset = _get_visual(data, offset)
+            top["offer_visuals"].append(v)
+    changed = {}
+    for _ in range(changed_count):
+        change, team = CHANGE.unpack_from(data, offset)
+        name, offset = _get_str(data, offset + CHANGE.size)
+        fields: dict = {}
+        if change & C_POS:
+            x, y = POS.unpack_from(data, offset)
+            offset += POS.size
+            fields["pos"] = [x / POS_SCALE, y / POS_SCALE]
+        if change & C_HP:
+            (fields["hp"],) = HP.unpack_from(data, offset)
+            offset += HP.size
+        if change & C_ARMOR:
+            (fields["armor"],) = ARMOR.unpack_from(data, offset)
+            offset += ARMOR.size
+        if change & C_RANGE:
+            (fields["weapon_range"],) = RANGE.unpack_from(data, offset)
+            offset += RANGE.size
+        if change & C_ALIVE:
+            fields["alive"] = bool(change & C_ALIVE_VALUE)
+        if change & C_TEAM:
+            fields["team"] = team if change & C_TEAM_VALUE else None
+        if change & C_JID:
+            fields["jid"], offset = _get_str(data, offset)
+        changed[name] = fields
+    delta: dict = {"top": top, "changed": changed}
+    if added_count:
+        delta["added"] = []
+        for _ in range(added_count):
+            g, offset = _get_gladiator(data, offset)
+            delta["added"].append(g)
+    if removed_count:
+        delta["removed"] = []
+        for _ in range(removed_count):
+            name, offset = _get_str(data, offset)
+            delta["removed"].append(name)
+    if flags & D_ORDER:
+        delta["order"] = []
+        for _ in range(order_count):
+            name, offset = _get_str(data, offset)
+            delta["order"].append(name)
+    return {"kind": "delta", "seq": seq, "base": base, "delta": delta}
+
+def _pack_intent(out: bytearray, intent: dict) -> None:
+    action = intent.get("action")
+    target = intent.get("target")
+    move = intent.get("move")
+    ack = intent.get("ack")
+    flags = (
+        (I_ACTION if action else 0)
+        | (I_TARGET if target is not None else 0)
+        | (I_MOVE if move is not None else 0)
+        | (I_ATTACK if intent.get("attack") else 0)
+        | (I_ACK if ack is not None else 0)
+    )
+    dx, dy = move if move is not None else (0.0, 0.0)
+    out += INTENT.pack(flags, ACTIONS.index(action) if action else 0, _q(dx), _q(dy), ack or 0)
+    _put_str(out, intent["name"])
+    if target is not None:
+        _put_str(out, target)
+
+def _unpack_intent(data: bytes, offset: int) -> dict:
+    flags, action, dx, dy, ack = INTENT.unpack_from(data, offset)
+    name, offset = _get_str(data, offset + INTENT.size)
+    intent: dict = {"name": name}
+    if flags & I_ACTION:
+        intent["action"] = ACTIONS[action]
+    if flags & I_TARGET:
+        intent["target"], offset = _get_str(data, offset)
+    if flags & I_MOVE:
+        intent["move"] = [dx / POS_SCALE, dy / POS_SCALE]
+        intent["attack"] = bool(flags & I_ATTACK)
+    if flags & I_ACK:
+        intent["ack"] = ack
+    return intent
+
+def _pack(payload: dict) -> bytes | None:
+    out = bytearray()
+    if "gladiators" in payload:
+        out += HEADER.pack(MAGIC, VERSION, KIND_STATE)
+        _pack_state(out, payload)
+    elif payload.get("kind") == "key":
+        out += HEADER.pack(MAGIC, VERSION, KIND_KEYFRAME)
+        out += SEQ.pack(payload["seq"])
+        _pack_state(out, payload["state"])
+    elif payload.get("kind") == "delta":
+        out += HEADER.pack(MAGIC, VERSION, KIND_DELTA)
+        _pack_delta(out, payload["seq"], payload["base"], payload["delta"])
+    elif "name" in payload and set(payload) <= {"name", "action", "target", "move", "attack", "ack"}:
+        out += HEADER.pack(MAGIC, VERSION, KIND_INTENT)
+        _pack_intent(out, payload)
+    else:
+        return None
+    return bytes(out)
+
+def _unpack(data: bytes) -> dict:
+    magic, version, kind = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"unsupported arena message {magic!r} v{version}")
+    offset = HEADER.size
+    if kind == KIND_STATE:
+        return _unpack_state(data, offset)
+    if kind == KIND_KEYFRAME:
+        (seq,) = SEQ.unpack_from(data, offset)
+        return {"kind": "key", "seq": seq, "state": _unpack_state(data, offset + SEQ.size)}
+    if kind == KIND_INTENT:
+        return _unpack_intent(data, offset)
+    if kind == KIND_DELTA:
+        return _unpack_delta(data, offset)
+    raise ValueError(f"unknown arena message kind {kind}")
+
+# PORUKA -> (VRSTA SADRŽAJA, TIJELO); ŠTO BINARNI ZAPIS NE POKRIVA IDE KAO JSON
+def encode(payload: dict, content_type: str = CONTENT_TYPE_JSON) -> tuple[str, str]:
+    if content_type == CONTENT_TYPE_BINARY:
+        try:
+            packed = _pack(payload)
+        except (KeyError, TypeError, ValueError, struct.error):
+            packed = None
+        if packed is not None:
+            return CONTENT_TYPE_BINARY, base64.b64encode(packed).decode("ascii")
+    return CONTENT_TYPE_JSON, json.dumps(payload)
+
+# BEZ VRSTE SADRŽAJA PORUKA SE ČITA KAO JSON
+def decode(body: str, content_type: str | None = None) -> dict:
+    if content_type == CONTENT_TYPE_BINARY:
+        return _unpack(base64.b64decode(body))
+    return json.loads(body)
+
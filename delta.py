@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+KIND_KEY, KIND_DELTA = "key", "delta"
+HISTORY_SIZE = 8
+
+# RAZLIKA DVAJU STANJA: SAMO PROMIJENJENA POLJA, GLADIJATORI PO IMENU
+def diff_state(base: dict, state: dict) -> dict:
+    top = {key: value for key, value in state.items() if key != "gladiators" and base.get(key) != value}
+    old = {g["name"]: g for g in base.get("gladiators", [])}
+    changed: dict[str, dict] = {}
+    added = []
+    names = []
+    for g in state.get("gladiators", []):
+        names.append(g["name"])
+        prev = old.pop(g["name"], None)
+        if prev is None:
+            added.append(g)
+            continue
+        fields = {key: value for key, value in g.items() if prev.get(key) != value}
+        if fields:
+            changed[g["name"]] = fields
+    delta: dict = {"top": top, "changed": changed}
+    if added:
+        delta["added"] = added
+    if old:
+        delta["removed"] = list(old)
+    # REDOSLIJED SE ŠALJE SAMO AKO SE PROMIJENIO
+    if added or old or [g["name"] for g in base.get("gladiators", [])] != names:
+        delta["order"] = names
+    return delta
+
+# PRIMJENA RAZLIKE NA LOKALNI POGLED; VRAĆA NOVO STANJE
+def apply_delta(view: dict, delta: dict) -> dict:
+    state = {key: value for key, value in view.items() if key != "gladiators"}
+    state.update(delta.get("top", {}))
+    by_name = {g["name"]: g for g in view.get("gladiators", [])}
+    for name in delta.get("removed", []):
+        by_name.pop(name, None)
+    for g in delta.get("added", []):
+        by_name[g["name"]] = g
+    for name, fields in delta.get("changed", {}).items():
+        g = by_name.get(name)
+        if g is not None:
+            by_name[name] = {**g, **fields}
+    order = delta.get("order")
+    if order is None:
+        state["gladiators"] = [by_name[g["name"]] for g in view.get("gladiators", []) if g["name"] in by_name]
+    else:
+        state["gladiators"] = [by_name[name] for name in order if name in by_name]
+    return state
+
+# STRANA ARENE: POVIJEST POSLANIH STANJA I POTVRDE PRIMATELJA
+class DeltaEncoder:
+    def __init__(self, keyframe_interval: int = 10, history_size: int = HISTORY_SIZE):
+        self.keyframe_interval = keyframe_interval
+        self.history_size = history_size
+        self.seq = 0
+        self.history: dict[int, dict] = {}
+        self.acked: dict[str, int] = {}
+        self.view_history: dict[int, dict[str, dict]] = {}
+
+    def ack(self, recipient: str, seq: int) -> None:
+        if seq > self.acked.get(recipient, -1):
+            self.acked[recipient] = seq
+
+    def _next(self) -> bool:
+        self.seq += 1
+        return self.seq % self.keyframe_interval == 1 or self.keyframe_interval <= 1
+
+    def _payload(self, base: int | None, previous: dict | None, state: dict) -> dict:
+        if base is None or previous is None:
+            return {"kind": KIND_KEY, "seq": self.seq, "state": state}
+        return {"kind": KIND_DELTA, "seq": self.seq, "base": base, "delta": diff_state(previous, state)}
+
+    # NOVO STANJE -> {BAZA: PORUKA}; BAZA None ZNAČI KLJUČNI OKVIR
+    def push(self, state: dict, recipients: list[str]) -> tuple[dict[int | None, dict], dict[str, int | None]]:
+        keyframe = self._next()
+        bases: dict[str, int | None] = {}
+        for recipient in recipients:
+            base = self.acked.get(recipient)
+            bases[recipient] = None if keyframe or base not in self.history else base
+        messages = {base: self._payload(base, self.history.get(base), state) for base in set(bases.values())}
+        self.history[self.seq] = state
+        self.history.pop(self.seq - self.history_size, None)
+        return messages, bases
+
+    # ZASEBAN POGLED ZA SVAKOG PRIMATELJA -> {PRIMATELJ: PORUKA}
+    def push_views(self, views: dict[str, dict]) -> dict[str, dict]:
+        keyframe = self._next()
+        messages = {}
+        for recipient, view in views.items():
+            base = None if keyframe else self.acked.get(recipient)
+            previous = self.view_history.get(base, {}).get(recipient)
+            messages[recipient] = self._payload(base, previous, view)
+        self.view_history[self.seq] = views
+        self.view_history.pop(self.seq - self.history_size, None)
+        return messages
+
+# STRANA AGENTA: LOKALNI POGLED IZGRAĐEN IZ KLJUČNIH OKVIRA I RAZLIKA
+class DeltaView:
+    def __init__(self, history_size: int = HISTORY_SIZE):
+        self.history_size = history_size
+        self.seq: int | None = None
+        self.state: dict | None = None
+        # ARENA MOŽE POSLATI RAZLIKU OD STARIJE POTVRDE DOK NOVIJA JOŠ PUTUJE
+        self.history: dict[int, dict] = {}
+
+    # None AKO JE RAZLIKA ZASTARJELA ILI NJEZINA BAZA VIŠE NIJE POZNATA
+    def apply(self, message: dict) -> dict | None:
+        kind = message.get("kind")
+        seq = message.get("seq")
+        if kind == KIND_KEY:
+            # KLJUČNI OKVIR SE UVIJEK PRIHVAĆA (NPR. NAKON PONOVNOG POKRETANJA ARENE)
+            if self.seq is not None and seq <= self.seq:
+                self.history.clear()
+            state = message["state"]
+        elif kind == KIND_DELTA and seq > (self.seq or 0) and message.get("base") in self.history:
+            state = apply_delta(self.history[message["base"]], message["delta"])
+        else:
+            return None
+        self.seq = seq
+        self.state = state
+        self.history[seq] = state
+        for old in [old for old in self.history if old <= seq - self.history_size]:
+            del self.history[old]
+        return state
@@ -1,13 +1,22 @@
 from __future__ import annotations
 import random
 import math
-import time
+from typing import TYPE_CHECKING
 import pygame
 import settings
+from simclock import SimClock
+from textcache import render_text
+
+if TYPE_CHECKING:
+    from projectiles import ProjectilePool
+    from registry import GladiatorRegistry
+    from spatial import SpatialGrid
 TEAM_SYMBOL_NAMES = ["Square", "Diamond", "Triangle", "Star"]
 
 # INICIJALIZIRANJE KLASE ORUŽJA
 class Weapon:
+    __slots__ = ("name", "damage", "range", "cooldown", "ranged", "projectile_speed")
+
     def __init__(self, name: str, damage: int, range_px: float, cooldown: float, ranged: bool = False, projectile_speed: float = 0.0):
         self.name = name
         self.damage = damage
@@ -16,49 +25,46 @@ class Weapon:
         self.ranged = ranged
         self.projectile_speed = projectile_speed
 
-# INICIJALIZIRANJE KLASE PROJEKTILA ORUŽJA
-class Projectile:
-    def __init__(self, position: pygame.Vector2, velocity: pygame.Vector2, damage: int, owner: "Gladiator", target: "Gladiator"):
-        self.position = pygame.Vector2(position)
-        self.velocity = pygame.Vector2(velocity)
-        self.damage = damage
-        self.owner = owner
-        self.target = target
-        self.radius = 5
-        self.alive = True
-
-    def update(self, dt: float) -> None:
-        if not self.alive:
-            return
-        self.position += self.velocity * dt
-        if not self.target.alive:
-            self.alive = False
-            return
-        if self.position.distance_to(self.target.position) <= self.radius + self.target.radius:
-            self._hit(self.target)
-            self.alive = False
-            return
-        if (self.position - settings.ARENA_CENTER).length() > settings.ARENA_RADIUS + 50:
-            self.alive = False
-
-    def _hit(self, target: "Gladiator") -> None:
-        raw_damage = self.damage + random.randint(-3, 3)
-        mitigated = max(1, int(raw_damage - target.armor * 0.25))
-        target.apply_damage(mitigated, self.owner)
-
-    def draw(self, surface: pygame.Surface) -> None:
-        if not self.alive:
-            return
-        if self.velocity.length_squared() == 0:
-            pygame.draw.circle(surface, (10, 10, 10), self.position, 3)
-            return
-        dir_vec = self.velocity.normalize()
-        tip = self.position + dir_vec * 10
-        tail = self.position - dir_vec * 6
-        pygame.draw.line(surface, (10, 10, 10), tail, tip, width=2)
-
 # INICIJALIZIRANJE KLASE GLADIJATORA
 class Gladiator:
+    __slots__ = (
+        "rng",
+        "clock",
+        "name",
+        "class_type",
+        "registry",
+        "_team_id",
+        "position",
+        "prev_position",
+        "velocity",
+        "steer_x",
+        "steer_y",
+        "speed",
+        "radius",
+        "_hp",
+        "max_hp",
+        "alive",
+        "armor",
+        "weapon",
+        "cooldown_until",
+        "last_attacker",
+        "retreating",
+        "sprint_until",
+        "retreat_cooldown_until",
+        "retreat_uses",
+        "wander_until",
+        "wander_dir",
+        "last_hit_time",
+        "kite_until",
+        "kite_dir",
+        "last_team_change",
+        "has_betrayed_opp",
+        "has_betrayed_end",
+        "shield_active",
+        "shield_until",
+        "shield_cooldown_until",
+    )
+
     def __init__(
         self,
         name: str,
@@ -68,39 +74,116 @@ class Gladiator:
         armor: int,
         speed: float,
         weapon: Weapon,
+        rng: random.Random | None = None,
+        clock: SimClock | None = None,
     ):
+        self.registry: GladiatorRegistry | None = None
+        self.rng = rng if rng is not None else random.Random()
+        self.clock = clock if clock is not None else SimClock()
         self.name = name
         self.class_type = class_type
-        self.team_id: int | None = None
+        self._team_id: int | None = None
         self.position = pygame.Vector2(position)
+        self.prev_position = pygame.Vector2(position)
         self.velocity = pygame.Vector2()
+        self.steer_x = 0.0
+        self.steer_y = 0.0
         self.speed = speed
         self.radius = settings.GLADIATOR_RADIUS
-        self.hp = hp
+        self._hp = hp
         self.max_hp = hp
+        self.alive = hp > 0
         self.armor = armor
         self.weapon = weapon
-        self.cooldown_timer = 0.0
+        self.cooldown_until = 0.0
         self.last_attacker: Gladiator | None = None
         self.retreating = False
-        self.sprint_timer = 0.0
-        self.retreat_cooldown = 0.0
+        self.sprint_until = 0.0
+        self.retreat_cooldown_until = 0.0
         self.retreat_uses = 0
-        self.wander_timer = random.uniform(0.8, 2.0)
-        self.wander_dir = self._random_dir()
+        self.wander_until = self.clock.now + self.rng.uniform(0.8, 2.0)
+        self.wander_dir = self._random_dir(pygame.Vector2())
         self.last_hit_time = 0.0
-        self.kite_timer = 0.0
+        self.kite_until = 0.0
         self.kite_dir = pygame.Vector2()
         self.last_team_change: float | None = None
         self.has_betrayed_opp = False
         self.has_betrayed_end = False
         self.shield_active = False
-        self.shield_timer = 0.0
-        self.shield_cooldown = 0.0
+        self.shield_until = 0.0
+        self.shield_cooldown_until = 0.0
+
+    # PROMJENE ŽIVOTA I TIMA JAVLJAJU SE REGISTRU
+    @property
+    def hp(self) -> int:
+        return self._hp
+
+    @hp.setter
+    def hp(self, value: int) -> None:
+        self._hp = value
+        alive = value > 0
+        if self.registry is None:
+            self.alive = alive
+        elif alive != self.alive:
+            self.alive = alive
+            if alive:
+                self.registry.on_revive(self)
+            else:
+                self.registry.on_death(self)
+        elif alive:
+            self.registry.on_hp_change(self)
+
+    @property
+    def team_id(self) -> int | None:
+        return self._team_id
+
+    @team_id.setter
+    def team_id(self, value: int | None) -> None:
+        old = self._team_id
+        if value == old:
+            return
+        self._team_id = value
+        if self.registry is not None:
+            self.registry.on_team_change(self, old, value)
+
+    # PREOSTALO VRIJEME DO ROKA (ZA PRIKAZ)
+    @property
+    def cooldown_timer(self) -> float:
+        return max(0.0, self.cooldown_until - self.clock.now)
+
+    @property
+    def sprint_timer(self) -> float:
+        return max(0.0, self.sprint_until - self.clock.now)
 
     @property
-    def alive(self) -> bool:
-        return self.hp > 0
+    def retreat_cooldown(self) -> float:
+        return max(0.0, self.retreat_cooldown_until - self.clock.now)
+
+    @property
+    def wander_timer(self) -> float:
+        return max(0.0, self.wander_until - self.clock.now)
+
+    @property
+    def kite_timer(self) -> float:
+        return max(0.0, self.kite_until - self.clock.now)
+
+    @property
+    def shield_timer(self) -> float:
+        return max(0.0, self.shield_until - self.clock.now) if self.shield_active else 0.0
+
+    @property
+    def shield_cooldown(self) -> float:
+        return max(0.0, self.shield_cooldown_until - self.clock.now)
+
+    # DOGAĐAJI KOJE SAT POZIVA KADA ROK DOSPIJE
+    def _expire_shield(self) -> None:
+        if self.shield_active and self.shield_until <= self.clock.now:
+            self.shield_active = False
+
+    def _end_retreat(self) -> None:
+        if self.retreating and self.sprint_until <= self.clock.now and not self._should_retreat(()):
+            self.retreating = False
+            self.retreat_cooldown_until = self.clock.now + (0.0 if self.class_type == "Archer" else 3.0)
 
     def distance_to(self, other: "Gladiator") -> float:
         return self.position.distance_to(other.position)
@@ -110,47 +193,38 @@ class Gladiator:
         dt: float,
         gladiators: list["Gladiator"],
         allow_engage: bool,
-        projectiles: list[Projectile],
+        projectiles: "ProjectilePool",
         intent: dict | None = None,
-        targeted_by: set[str] | None = None,
+        targeted_by: list["Gladiator"] | None = None,
         allow_shield: bool = True,
+        grid: "SpatialGrid | None" = None,
     ) -> None:
+        self.prev_position.update(self.position)
         if not self.alive:
+            if self in projectiles.incoming:
+                projectiles.drop_target(self)
             return
 
-        # AŽURIRANJE VREMENSKIH PARAMETARA
-        self.cooldown_timer = max(0.0, self.cooldown_timer - dt)
-        if self.retreating:
-            self.sprint_timer = max(0.0, self.sprint_timer - dt)
-        if self.retreat_cooldown > 0:
-            self.retreat_cooldown = max(0.0, self.retreat_cooldown - dt)
-        if self.kite_timer > 0:
-            self.kite_timer = max(0.0, self.kite_timer - dt)
-        if self.shield_cooldown > 0:
-            self.shield_cooldown = max(0.0, self.shield_cooldown - dt)
-        if self.shield_active:
-            self.shield_timer = max(0.0, self.shield_timer - dt)
-            if self.shield_timer <= 0:
-                self.shield_active = False
+        # ROKOVI NA SIMULACIJSKOM SATU UMJESTO ODBROJAVANJA SVAKI KORAK
+        # GLADIJATOR BEZ METE PRESKAČE ODLUKE, ALI LUTANJE, TRZANJE I RAZDVAJANJE IDU SVAKI KORAK
+        now = self.clock.now
 
         # ODLUKA O AKTIVIRANJU ŠTITA
-        if allow_shield and self.class_type in ("Fighter", "Tank") and not self.shield_active and self.shield_cooldown <= 0.0:
-            if self._incoming_attack(gladiators, targeted_by or set()):
+        if allow_shield and self.class_type in ("Fighter", "Tank") and not self.shield_active and now >= self.shield_cooldown_until:
+            if self._incoming_attack(gladiators, targeted_by or (), grid):
                 duration, cooldown = self._shield_params()
                 self.shield_active = True
-                self.shield_timer = duration
-                self.shield_cooldown = cooldown
+                self.shield_until = now + duration
+                self.shield_cooldown_until = now + cooldown
+                self.clock.schedule(self.shield_until, self._expire_shield)
 
         # AKTIVIRANJE POVLAČENJA AGENTA
         if allow_engage:
-            should_retreat = self._should_retreat(gladiators)
-            if should_retreat and not self.retreating:
+            if not self.retreating and self._should_retreat(gladiators):
                 self.retreating = True
-                self.sprint_timer = 1.0 if self.class_type == "Archer" else 2.0
+                self.sprint_until = now + (1.0 if self.class_type == "Archer" else 2.0)
                 self.retreat_uses += 1
-            elif self.retreating and not should_retreat and self.sprint_timer <= 0:
-                self.retreating = False
-                self.retreat_cooldown = 0.0 if self.class_type == "Archer" else 3.0
+                self.clock.schedule(self.sprint_until, self._end_retreat)
         else:
             self.retreating = False
 
@@ -158,22 +232,35 @@ class Gladiator:
         target = None
         if allow_engage:
             if intent and intent.get("target"):
-                target = next((g for g in gladiators if g.name == intent.get("target") and g.alive), None)
+                if self.registry is not None:
+                    target = self.registry.get_living(intent.get("target"))
+                else:
+                    target = next((g for g in gladiators if g.name == intent.get("target") and g.alive), None)
             if target is None:
-                target = self._pick_target(gladiators)
-        offset = target.position - self.position if target else pygame.Vector2()
-        distance = offset.length()
+                target = self._pick_target(gladiators, grid)
+        # SKALARNA MATEMATIKA I AŽURIRANJE NA MJESTU (BEZ PRIVREMENIH VEKTORA)
+        position = self.position
+        px = position.x
+        py = position.y
+        if target:
+            dx = target.position.x - px
+            dy = target.position.y - py
+            distance = math.hypot(dx, dy)
+        else:
+            dx = dy = distance = 0.0
 
         # ODREĐIVANJE SMJERA KRETANJA AGENTA
-        desired = pygame.Vector2()
+        desired_x = desired_y = 0.0
         if self.retreating:
-            flee_dir = self._flee_direction(gladiators)
-            if flee_dir.length_squared() == 0:
-                flee_dir = -offset.normalize() if distance > 0 else pygame.Vector2(1, 0)
-            desired = flee_dir
+            desired_x, desired_y = self._flee_direction(gladiators, grid)
+            if desired_x == 0.0 and desired_y == 0.0:
+                if distance > 0:
+                    desired_x, desired_y = -dx / distance, -dy / distance
+                else:
+                    desired_x = 1.0
         else:
-            if self.class_type == "Archer" and self.kite_timer > 0 and self.kite_dir.length_squared() > 0:
-                desired = self.kite_dir
+            if self.class_type == "Archer" and now < self.kite_until and (self.kite_dir.x or self.kite_dir.y):
+                desired_x, desired_y = self.kite_dir.x, self.kite_dir.y
             elif target:
                 if self.weapon.ranged:
                     attack_thresh = self.weapon.range * 0.9
@@ -182,50 +269,67 @@ class Gladiator:
                     attack_thresh = self.radius + target.radius + 2
                 if distance > attack_thresh:
                     if distance > 0:
+                        desired_x, desired_y = dx / distance, dy / distance
                         if intent and intent.get("move"):
-                            move_vec = pygame.Vector2(intent["move"])
-                            if move_vec.length_squared() > 0:
-                                desired = move_vec.normalize()
-                            else:
-                                desired = offset.normalize()
-                        else:
-                            desired = offset.normalize()
+                            move_x, move_y = intent["move"]
+                            move_len = math.hypot(move_x, move_y)
+                            if move_len > 0:
+                                desired_x, desired_y = move_x / move_len, move_y / move_len
                 else:
                     self._attack(target, projectiles)
             else:
-                self.wander_timer -= dt
-                if self.wander_timer <= 0:
-                    self.wander_dir = self._random_dir()
-                    self.wander_timer = random.uniform(0.8, 2.0)
-                desired = self.wander_dir
+                if now >= self.wander_until:
+                    self._random_dir(self.wander_dir)
+                    self.wander_until = now + self.rng.uniform(0.8, 2.0)
+                desired_x, desired_y = self.wander_dir.x, self.wander_dir.y
 
         # ODREĐIVANJE BRZINE KRETANJA AGENTA
-        jitter = pygame.Vector2(random.uniform(-0.35, 0.35), random.uniform(-0.35, 0.35))
+        jitter_x = self.rng.uniform(-0.35, 0.35)
+        jitter_y = self.rng.uniform(-0.35, 0.35)
         speed = self.speed
-        if self.retreating and self.sprint_timer > 0:
+        if self.retreating and now < self.sprint_until:
             speed *= 1.6
         elif self.retreating:
             speed *= 1.2
-        elif self.class_type == "Archer" and self.kite_timer > 0:
+        elif self.class_type == "Archer" and now < self.kite_until:
             speed *= 0.7
-        self.velocity = (desired + jitter) * speed
+        steer_x = desired_x * speed
+        steer_y = desired_y * speed
+        vx = steer_x + jitter_x * speed
+        vy = steer_y + jitter_y * speed
 
         # RAZDVAJANJE AGENATA
-        separation = pygame.Vector2()
-        for other in gladiators:
+        sep_x = sep_y = 0.0
+        reach = self.radius * 2
+        neighbours = grid.query(position, reach) if grid else gladiators
+        for other in neighbours:
             if other is self or not other.alive:
                 continue
-            d = self.distance_to(other)
-            if 0 < d < self.radius * 2:
-                separation += (self.position - other.position) / max(d, 1e-3)
-        if separation.length_squared() > 0:
-            separation = separation.normalize() * self.speed
-            self.velocity = (self.velocity + separation * 0.7) * 0.6
-        self.position += self.velocity * dt
+            ox = px - other.position.x
+            oy = py - other.position.y
+            d = math.hypot(ox, oy)
+            if 0 < d < reach:
+                sep_x += ox / max(d, 1e-3)
+                sep_y += oy / max(d, 1e-3)
+        if sep_x or sep_y:
+            scale = self.speed / math.hypot(sep_x, sep_y)
+            vx = (vx + sep_x * scale * 0.7) * 0.6
+            vy = (vy + sep_y * scale * 0.7) * 0.6
+            steer_x = (steer_x + sep_x * scale * 0.7) * 0.6
+            steer_y = (steer_y + sep_y * scale * 0.7) * 0.6
+        self.velocity.update(vx, vy)
+        # BRZINA BEZ NASUMIČNOG TRZANJA; PROJEKTILI PREMA META PLANIRAJU SE PREMA NJOJ
+        self.steer_x = steer_x
+        self.steer_y = steer_y
+        if self in projectiles.incoming:
+            projectiles.target_steered(self)
+        position.update(px + vx * dt, py + vy * dt)
         self._clamp_to_arena()
 
     # ODLUKA O SLJEDEĆEM PROTIVNIKU
-    def _pick_target(self, gladiators: list["Gladiator"]) -> "Gladiator | None":
+    def _pick_target(self, gladiators: list["Gladiator"], grid: "SpatialGrid | None" = None) -> "Gladiator | None":
+        if grid is not None:
+            return self._pick_target_grid(grid)
         living = [
             g
             for g in gladiators
@@ -237,21 +341,37 @@ class Gladiator:
             return self.last_attacker
         return min(living, key=lambda g: self.distance_to(g))
 
+    def _pick_target_grid(self, grid: "SpatialGrid") -> "Gladiator | None":
+        attacker = self.last_attacker
+        if attacker and attacker.alive and attacker is not self and (self.team_id is None or attacker.team_id != self.team_id):
+            return attacker
+        nearest = grid.nearest(
+            self.position,
+            lambda g: g is not self and g.alive and (self.team_id is None or g.team_id != self.team_id),
+        )
+        if nearest is None:
+            return None
+        if attacker and attacker.alive:
+            return attacker
+        return nearest
+
     # ODLUKA O NAPADU PROTIVNIKA
-    def _attack(self, target: "Gladiator", projectiles: list[Projectile]) -> None:
-        if self.cooldown_timer > 0.0 or not target.alive:
+    def _attack(self, target: "Gladiator", projectiles: "ProjectilePool") -> None:
+        now = self.clock.now
+        if now < self.cooldown_until or not target.alive:
             return
-        self.cooldown_timer = self.weapon.cooldown
+        self.cooldown_until = now + self.weapon.cooldown
         if self.weapon.ranged:
             direction = (target.position - self.position)
             if direction.length_squared() == 0:
-                direction = self._random_dir()
+                self._random_dir(direction)
             velocity = direction.normalize() * self.weapon.projectile_speed
-            projectiles.append(Projectile(self.position, velocity, self.weapon.damage, self, target))
-            self.kite_dir = -direction.normalize()
-            self.kite_timer = 0.2
+            projectiles.spawn(self.position, velocity, self.weapon.damage, self, target)
+            self.kite_dir.update(-direction.x, -direction.y)
+            self.kite_dir.normalize_ip()
+            self.kite_until = now + 0.2
         else:
-            raw_damage = self.weapon.damage + random.randint(-3, 3)
+            raw_damage = self.weapon.damage + self.rng.randint(-3, 3)
             mitigated = max(1, int(raw_damage - target.armor * 0.25))
             target.apply_damage(mitigated, self)
 
@@ -259,33 +379,52 @@ class Gladiator:
     def _should_retreat(self, gladiators: list["Gladiator"]) -> bool:
         if self.hp <= 0:
             return False
-        if self.retreat_uses >= 1 or self.retreat_cooldown > 0:
+        if self.retreat_uses >= 1 or self.clock.now < self.retreat_cooldown_until:
             return False
         hp_ratio = self.hp / max(1, self.max_hp)
         return hp_ratio <= 0.66
 
+    def _is_other_alive(self, other: "Gladiator") -> bool:
+        return other is not self and other.alive
+
     # IZRAČUN SMJERA POVLAČENJA
-    def _flee_direction(self, gladiators: list["Gladiator"]) -> pygame.Vector2:
-        away = pygame.Vector2()
-        for g in gladiators:
-            if g is self or not g.alive:
-                continue
-            offset = self.position - g.position
-            dist = offset.length()
-            if dist == 0 or dist > 360:
+    def _flee_direction(self, gladiators: list["Gladiator"], grid: "SpatialGrid | None" = None) -> tuple[float, float]:
+        px = self.position.x
+        py = self.position.y
+        away_x = away_y = 0.0
+        # BJEŽI SE OD NAJBLIŽIH FLEE_NEIGHBOURS, NE OD SVIH U RADIJUSU (CIJENA NE RASTE S GUSTOĆOM)
+        radius = settings.FLEE_RADIUS
+        if grid:
+            nearest = grid.nearest_k(self.position, settings.FLEE_NEIGHBOURS, radius, self._is_other_alive)
+        else:
+            nearest = sorted(
+                (
+                    (math.hypot(px - g.position.x, py - g.position.y), g)
+                    for g in gladiators
+                    if self._is_other_alive(g)
+                ),
+                key=lambda entry: entry[0],
+            )
+            nearest = [entry for entry in nearest[: settings.FLEE_NEIGHBOURS] if entry[0] <= radius]
+        for dist, g in nearest:
+            if dist == 0:
                 continue
-            away += offset / max(dist, 1e-3)
-        if away.length_squared() > 0:
-            return away.normalize()
-        return pygame.Vector2()
+            away_x += (px - g.position.x) / max(dist, 1e-3)
+            away_y += (py - g.position.y) / max(dist, 1e-3)
+        if away_x or away_y:
+            length = math.hypot(away_x, away_y)
+            return away_x / length, away_y / length
+        return 0.0, 0.0
 
     # OGRANIČAVANJE KRETANJA AGENATA
     def _clamp_to_arena(self) -> None:
-        offset = self.position - settings.ARENA_CENTER
-        dist = offset.length()
+        center = settings.ARENA_CENTER
+        ox = self.position.x - center.x
+        oy = self.position.y - center.y
+        dist = math.hypot(ox, oy)
         limit = settings.ARENA_RADIUS - self.radius
         if dist > limit and dist > 0:
-            self.position = settings.ARENA_CENTER + offset.normalize() * limit
+            self.position.update(center.x + ox / dist * limit, center.y + oy / dist * limit)
 
     # CRTANJE SVIH TEKSTURA U SIMULACIJI
     def draw(
@@ -298,7 +437,7 @@ class Gladiator:
         fighter_texture_dead: pygame.Surface,
         tank_texture_dead: pygame.Surface,
         archer_texture_dead: pygame.Surface,
-    ) -> None:
+    ) -> pygame.Rect:
         if not self.alive:
             if self.class_type == "Fighter":
                 texture = fighter_texture_dead
@@ -307,8 +446,7 @@ class Gladiator:
             else:
                 texture = archer_texture_dead
             texture_rect = texture.get_rect(center=(self.position.x, self.position.y))
-            surface.blit(texture, texture_rect)
-            return
+            return surface.blit(texture, texture_rect)
         if self.class_type == "Fighter":
             texture = fighter_texture
         elif self.class_type == "Tank":
@@ -316,7 +454,7 @@ class Gladiator:
         else:
             texture = archer_texture
         texture_rect = texture.get_rect(center=(self.position.x, self.position.y))
-        surface.blit(texture, texture_rect)
+        dirty = surface.blit(texture, texture_rect)
 
         # CRTANJE TRAKE RAZINE ŽIVOTA AGENATA
         bar_width = int(self.radius * 2.6)
@@ -330,7 +468,7 @@ class Gladiator:
             gray = int(0.3 * hp_color[0] + 0.59 * hp_color[1] + 0.11 * hp_color[2])
             hp_color = (gray, gray, gray)
         pygame.draw.rect(surface, hp_color, (bar_x, bar_y, bar_width * hp_ratio, bar_height))
-        pygame.draw.rect(surface, (0, 0, 0), (bar_x, bar_y, bar_width, bar_height), width=1)
+        dirty.union_ip(pygame.draw.rect(surface, (0, 0, 0), (bar_x, bar_y, bar_width, bar_height), width=1))
 
         # ODREĐIVANJE POZICIJA LABELA AGENATA
         if self.team_id:
@@ -341,25 +479,23 @@ class Gladiator:
                 sym_color = (200, 40, 40)
             else:
                 sym_color = (20, 20, 20)
-            self._draw_symbol(surface, symbol_idx, symbol_x, symbol_y, size=14, color=sym_color)
+            dirty.union_ip(self._draw_symbol(surface, symbol_idx, symbol_x, symbol_y, size=14, color=sym_color))
 
         name_color = (0, 0, 0)
         label = self.name[1:] if self.name.startswith("G") else self.name
-        prev_bold = font.get_bold()
-        font.set_bold(True)
-        name_text = font.render(label, True, name_color)
-        font.set_bold(prev_bold)
+        name_text = render_text(font, label, name_color, bold=True)
         name_rect = name_text.get_rect(midright=(bar_x - 6, bar_y + bar_height / 2))
-        surface.blit(name_text, name_rect)
+        dirty.union_ip(surface.blit(name_text, name_rect))
+        return dirty
 
     # CRTANJE SIMBOLA TIMOVA
-    def _draw_symbol(self, surface: pygame.Surface, idx: int, cx: float, cy: float, size: int, color: tuple[int, int, int]) -> None:
+    def _draw_symbol(self, surface: pygame.Surface, idx: int, cx: float, cy: float, size: int, color: tuple[int, int, int]) -> pygame.Rect:
         shape = idx % len(TEAM_SYMBOL_NAMES)
         width = 0
         if shape == 0:
             rect = pygame.Rect(0, 0, size, size)
             rect.center = (cx, cy)
-            pygame.draw.rect(surface, color, rect, width=width)
+            return pygame.draw.rect(surface, color, rect, width=width)
         elif shape == 1:
             half = size // 2
             points = [
@@ -368,7 +504,7 @@ class Gladiator:
                 (cx, cy + half),
                 (cx - half, cy),
             ]
-            pygame.draw.polygon(surface, color, points, width=width)
+            return pygame.draw.polygon(surface, color, points, width=width)
         elif shape == 2:
             half = size // 2
             points = [
@@ -376,36 +512,44 @@ class Gladiator:
                 (cx + half, cy + half),
                 (cx - half, cy + half),
             ]
-            pygame.draw.polygon(surface, color, points, width=width)
+            return pygame.draw.polygon(surface, color, points, width=width)
         else:
             radius = size // 2
-            pygame.draw.circle(surface, color, (cx, cy), radius, width=0)
+            return pygame.draw.circle(surface, color, (cx, cy), radius, width=0)
 
-    def _random_dir(self) -> pygame.Vector2:
-        angle = random.uniform(0, 2 * math.pi)
-        return pygame.Vector2(math.cos(angle), math.sin(angle))
+    def _random_dir(self, out: pygame.Vector2) -> pygame.Vector2:
+        angle = self.rng.uniform(0, 2 * math.pi)
+        out.update(math.cos(angle), math.sin(angle))
+        return out
 
     # PRIMANJE ŠTETE GLADIJATORA
     def apply_damage(self, amount: int, attacker: "Gladiator") -> None:
         if self.shield_active:
             self.shield_active = False
-            self.shield_timer = 0.0
+            self.shield_until = 0.0
             self.last_attacker = attacker
-            self.last_hit_time = time.time()
+            self.last_hit_time = self.clock.now
             return
         self.hp -= amount
         self.last_attacker = attacker
-        self.last_hit_time = time.time()
+        self.last_hit_time = self.clock.now
 
     # PROCJENA PRIJETNJE NAPADA
-    def _incoming_attack(self, gladiators: list["Gladiator"], targeted_by: set[str]) -> bool:
-        for other in gladiators:
+    def _incoming_attack(
+        self,
+        gladiators: list["Gladiator"],
+        targeted_by: "list[Gladiator] | tuple" = (),
+        grid: "SpatialGrid | None" = None,
+    ) -> bool:
+        if targeted_by:
+            candidates = targeted_by
+        else:
+            candidates = grid.query(self.position, grid.max_reach) if grid else gladiators
+        for other in candidates:
             if other is self or not other.alive:
                 continue
             if self.team_id is not None and other.team_id == self.team_id:
                 continue
-            if targeted_by and other.name not in targeted_by:
-                continue
             distance = self.distance_to(other)
             if other.weapon.ranged:
                 attack_thresh = other.weapon.range * 0.9
@@ -0,0 +1,73 @@
+import os
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import time
+import settings
+from arena import recalc_arena
+from match import Match
+from policy import GladiatorPlanner
+from settings import FPS, GLADIATOR_COUNT
+
+# POKRETANJE MEČA BEZ PRIKAZA I BEZ SPADE SERVERA
+def run_headless(
+    gladiator_count: int = GLADIATOR_COUNT,
+    class_list: list[str] | None = None,
+    dt: float = 1.0 / FPS,
+    max_time: float = 600.0,
+    intent_interval: float = 0.5,
+    use_agents: bool = True,
+    seed: int | None = None,
+) -> dict:
+    recalc_arena(settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT)
+    match = Match(gladiator_count, class_list, seed=seed)
+    match.use_intents = use_agents
+    planners = [GladiatorPlanner(f"{g.name.lower()}@localhost", rng=match.rng) for g in match.gladiators]
+    match.begin()
+
+    # AGENTI ODLUČUJU U ISTOM RITMU KAO ArenaAgent.PushState
+    next_push = intent_interval
+    while not match.finished and match.elapsed < max_time:
+        if use_agents and match.elapsed >= next_push:
+            next_push += intent_interval
+            state = match.state()
+            now = match.clock.now
+            for planner in planners:
+                intent = planner.plan(state, now)
+                if intent:
+                    match.intents[intent["name"]] = {"data": intent, "time": now}
+        match.step(dt)
+
+    return {
+        "seed": seed,
+        "winner": match.winner_text,
+        "winner_team": match.winner_team,
+        "winner_name": match.winner_name,
+        "finished": match.finished,
+        "elapsed": match.elapsed,
+        "ticks": match.ticks,
+        "projectile_high_water": match.projectiles.high_water,
+        "gladiators": match.stats(),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run one gladiator match without a window or SPADE server.")
+    parser.add_argument("--count", type=int, default=GLADIATOR_COUNT)
+    parser.add_argument("--dt", type=float, default=1.0 / FPS)
+    parser.add_argument("--max-time", type=float, default=600.0)
+    parser.add_argument("--no-agents", action="store_true")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    wall_start = time.perf_counter()
+    result = run_headless(args.count, dt=args.dt, max_time=args.max_time, use_agents=not args.no_agents, seed=args.seed)
+    wall = time.perf_counter() - wall_start
+    print(result["winner"] or settings.WINNER_FALLBACK_TEXT)
+    print(f"sim time {result['elapsed']:.2f}s in {result['ticks']} ticks, wall time {wall:.2f}s")
+    print(f"projectile pool high-water mark {result['projectile_high_water']}")
+    for row in result["gladiators"]:
+        team = row["team"] if row["team"] is not None else "-"
+        status = "alive" if row["alive"] else "dead"
+        print(f"  {row['name']:>4} {row['class']:<8} team {team:<2} {status:<5} hp {row['hp']}/{row['max_hp']}")
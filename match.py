@@ -0,0 +1,406 @@
+import random
+from arena import spawn_gladiators, team_label
+from entities import Gladiator, TEAM_SYMBOL_NAMES
+import settings
+from settings import build_state, gladiator_state
+from projectiles import ProjectilePool
+from registry import GladiatorRegistry
+from simclock import SimClock
+from spatial import SpatialGrid
+
+# PRAVILA I STANJE JEDNOG MEČA (NEOVISNO O PRIKAZU)
+class Match:
+    def __init__(self, gladiator_count: int, class_list: list[str] | None = None, seed: int | None = None):
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.clock = SimClock()
+        self.gladiator_count = gladiator_count
+        self.gladiators: list[Gladiator] = spawn_gladiators(gladiator_count, class_list, self.rng, self.clock)
+        self.registry = GladiatorRegistry(self.gladiators)
+        self.projectiles = ProjectilePool(clock=self.clock, analytic=settings.ANALYTIC_PROJECTILES)
+        self.grid = SpatialGrid()
+        self.view_grid = SpatialGrid()
+        self.views: dict[str, dict] = {}
+        self.views_due = 0.0
+        self.intents: dict = {}
+        self.pending_offers: dict[str, str] = {}
+        self.offer_visuals: list[dict] = []
+        self.use_intents = True
+        self.team_counter = 1
+        self.max_teams = len(TEAM_SYMBOL_NAMES)
+        self.started = False
+        self.finished = False
+        self.engage_delay = 0.0
+        self.elapsed = 0.0
+        self.ticks = 0
+        self.betrayal_pending = False
+        self.betrayal_timer = 0.0
+        self.betrayal_teams_done_opp: set[int] = set()
+        self.betrayal_teams_done_end: set[int] = set()
+        self.betrayal_global_opp_done = False
+        self.winner_text: str | None = None
+        self.winner_team: int | None = None
+        self.winner_name: str | None = None
+
+    def clear_offers(self) -> None:
+        self.pending_offers.clear()
+        self.offer_visuals.clear()
+
+    # POČETAK BORBE I FAZE PREGOVARANJA
+    def begin(self, negotiation_time: float = 10.0) -> None:
+        self.started = True
+        self.engage_delay = negotiation_time
+        self.clear_offers()
+        self.team_counter = 1
+        for g in self.gladiators:
+            g.team_id = None
+            g.has_betrayed_opp = False
+            g.has_betrayed_end = False
+            g.last_team_change = None
+
+    # SAŽETO STANJE ZA AGENTE
+    def state(self) -> dict:
+        return build_state(
+            self.gladiators,
+            pending_offers=self.pending_offers,
+            offer_visuals=self.offer_visuals,
+            negotiating=self.engage_delay > 0,
+            negotiation_time_left=self.engage_delay,
+        )
+
+    # POGLED SVAKOG ŽIVOG AGENTA: ON SAM (PRVI), SUIGRAČI I NAJBLIŽI PROTIVNICI
+    def agent_views(self, radius: float | None = None, max_enemies: int | None = None) -> dict[str, dict]:
+        radius = settings.PERCEPTION_RADIUS if radius is None else radius
+        max_enemies = settings.PERCEPTION_MAX_ENEMIES if max_enemies is None else max_enemies
+        living = [g for g in self.gladiators if g.alive]
+        self.view_grid.rebuild(living)
+        entries = {g.name: gladiator_state(g) for g in living}
+        order = {name: i for i, name in enumerate(entries)}
+        offers = [{"from": v, "to": k} for k, v in self.pending_offers.items()]
+        shared = {
+            "arena_jid": "arena@localhost",
+            "negotiating": self.engage_delay > 0,
+            "negotiation_time_left": self.engage_delay,
+            "arena": {
+                "center": [settings.ARENA_CENTER.x, settings.ARENA_CENTER.y],
+                "radius": settings.ARENA_RADIUS,
+            },
+        }
+        limit = radius * radius
+        views = {}
+        for g in living:
+            team = g.team_id
+            names = [g.name]
+            if team is not None:
+                stats = self.registry.teams.get(team)
+                if stats is not None:
+                    names += [name for name in tuple(stats.members) if name != g.name]
+
+            def is_enemy(other: Gladiator) -> bool:
+                return other is not g and (team is None or other.team_id != team)
+
+            nearby = []
+            for other in self.view_grid.query(g.position, radius):
+                if is_enemy(other):
+                    d = g.position.distance_squared_to(other.position)
+                    if d <= limit:
+                        nearby.append((d, other.name))
+            nearby.sort()
+            # ISTI REDOSLIJED KAO U PUNOM STANJU (JEDNAKE UDALJENOSTI)
+            enemies = sorted((name for _, name in nearby[:max_enemies]), key=order.__getitem__)
+            if not enemies:
+                nearest = self.view_grid.nearest(g.position, is_enemy)
+                if nearest is not None:
+                    enemies.append(nearest.name)
+            mine = [offer for offer in offers if g.name in (offer["from"], offer["to"])]
+            for offer in mine:
+                if offer["to"] == g.name and offer["from"] in entries and offer["from"] not in names + enemies:
+                    enemies.append(offer["from"])
+            views[g.name] = {
+                **shared,
+                "offers": mine,
+                "gladiators": [entries[name] for name in names + enemies],
+            }
+        return views
+
+    # SNIMKA POGLEDA SE GRADI NA NITI SIMULACIJE; NIT AGENATA SAMO ČITA self.views
+    def refresh_views(self, now: float, interval: float) -> None:
+        if now < self.views_due:
+            return
+        self.views = self.agent_views()
+        self.views_due = now + interval
+
+    def _team_size(self, team_id: int | None) -> int:
+        return self.registry.team_size(team_id)
+
+    def _can_create_team(self) -> bool:
+        return self.team_counter <= self.max_teams
+
+    def _upsert_visual(self, frm: str, to: str, color: tuple[int, int, int], ttl: float) -> None:
+        expires = self.clock.now + ttl
+        for v in self.offer_visuals:
+            if v["from"] == frm and v["to"] == to:
+                v["color"] = color
+                v["expires"] = expires
+                return
+        self.offer_visuals.append({"from": frm, "to": to, "color": color, "expires": expires})
+
+    # JEDAN KORAK PRAVILA MEČA
+    def step(self, dt: float) -> None:
+        if not self.started or self.finished:
+            return
+        self.elapsed += dt
+        self.ticks += 1
+        self.clock.advance(dt)
+        registry = self.registry
+
+        # PRAĆENJE FAZE PREGOVARANJA I STANJA TIMOVA
+        if self.engage_delay > 0:
+            self.engage_delay = max(0.0, self.engage_delay - dt)
+        negotiating = self.engage_delay > 0
+        if not negotiating:
+            self.clear_offers()
+
+        self._mid_fight_betrayal()
+
+        # FILTRIRANJE I AŽURIRANJE LINIJA PREGOVORA
+        now = self.clock.now
+        self.offer_visuals[:] = [v for v in self.offer_visuals if v.get("expires", now + 1) > now]
+
+        if negotiating:
+            self._negotiate()
+
+        # ANALIZA TRENUTNOG STANJA PREŽIVJELIH AGENATA
+        single_team_only = len(registry.teams) == 1 and not registry.solo
+        should_consider_betrayal = len(registry.living) > 1 and single_team_only and self.engage_delay <= 0
+
+        if should_consider_betrayal:
+            self._end_betrayal(dt, list(registry.living.values()), set(registry.teams))
+        else:
+            self.betrayal_pending = False
+
+        # PROVJERA ZAVRŠETKA I ODREĐIVANJE POBJEDNIKA
+        living = registry.living
+        if len(living) <= 1:
+            self.finished = True
+            if living:
+                lone = next(iter(living.values()))
+                if lone.team_id is not None:
+                    self._declare_team(lone.team_id)
+                else:
+                    self.winner_text = f"Champion: {lone.name}"
+                    self.winner_name = lone.name
+            else:
+                self.winner_text = "Everyone fell."
+        else:
+            self._fight(dt)
+
+    # IZDAJA TIMA TIJEKOM BORBE
+    def _mid_fight_betrayal(self) -> None:
+        registry = self.registry
+        if not registry.any_team_low(0.33):
+            return
+        team_counts = registry.team_counts()
+        for g in list(registry.living.values()):
+            if not registry.team_low(g.team_id, 0.33):
+                continue
+
+            other_teams = [tid for tid, count in team_counts.items() if tid != g.team_id and count < 3]
+            if (
+                other_teams
+                and self.rng.random() < 0.75
+                and not g.has_betrayed_opp
+                and g.team_id is not None
+                and g.team_id not in self.betrayal_teams_done_opp
+                and not self.betrayal_global_opp_done
+            ):
+                orig_team = g.team_id
+                g.team_id = self.rng.choice(other_teams)
+                g.last_team_change = self.clock.now
+                g.has_betrayed_opp = True
+                self.betrayal_teams_done_opp.add(orig_team)
+                self.betrayal_global_opp_done = True
+
+                team_counts = registry.team_counts()
+
+    # GLAVNI DIO PREGOVARANJA
+    def _negotiate(self) -> None:
+        intents = self.intents
+        pending_offers = self.pending_offers
+        glad_by_name = self.registry.by_name
+        for name, entry in list(intents.items()):
+            data = entry.get("data", {})
+            action = data.get("action")
+            if action == "offer":
+                target_name = data.get("target")
+                proposer = glad_by_name.get(name)
+                target = glad_by_name.get(target_name)
+                if proposer and target and proposer.alive and target.alive:
+                    proposer_size = self._team_size(proposer.team_id) or 1
+                    target_size = self._team_size(target.team_id) or 1
+                    if proposer_size < 3 and target_size < 3 and (proposer.team_id is None or proposer.team_id != target.team_id):
+                        pending_offers[target.name] = proposer.name
+                        self._upsert_visual(proposer.name, target.name, (150, 150, 150), ttl=self.engage_delay or 2)
+                intents.pop(name, None)
+            elif action == "accept":
+                proposer_name = data.get("target")
+                responder = glad_by_name.get(name)
+                proposer = glad_by_name.get(proposer_name)
+                if (
+                    responder
+                    and proposer
+                    and responder.alive
+                    and proposer.alive
+                    and pending_offers.get(responder.name) == proposer.name
+                ):
+                    proposer_size = self._team_size(proposer.team_id) or 1
+                    responder_size = self._team_size(responder.team_id) or 1
+                    merged = False
+
+                    if proposer.team_id and responder.team_id:
+                        if proposer.team_id != responder.team_id and proposer_size + responder_size <= 3:
+                            old_team = proposer.team_id
+                            new_team = responder.team_id
+                            for g in [g for g in self.gladiators if g.team_id == old_team]:
+                                g.team_id = new_team
+                            merged = True
+                    elif responder.team_id:
+                        if responder_size < 3:
+                            proposer.team_id = responder.team_id
+                            merged = True
+                    elif proposer.team_id:
+                        if proposer_size < 3:
+                            responder.team_id = proposer.team_id
+                            merged = True
+                    else:
+                        if self._can_create_team():
+                            responder.team_id = proposer.team_id = self.team_counter
+                            self.team_counter += 1
+                            merged = True
+                    pending_offers.pop(responder.name, None)
+                    self._upsert_visual(proposer.name, responder.name, (80, 200, 120) if merged else (200, 70, 70), ttl=1.0)
+                intents.pop(name, None)
+            elif action == "decline":
+                proposer_name = data.get("target")
+                responder = glad_by_name.get(name)
+                proposer = glad_by_name.get(proposer_name)
+                if responder and proposer and pending_offers.get(responder.name) == proposer.name:
+                    pending_offers.pop(responder.name, None)
+                    self._upsert_visual(proposer.name, responder.name, (200, 70, 70), ttl=1.0)
+                intents.pop(name, None)
+
+    # PROVJERA MOGUĆNOSTI ZAVRŠNE IZDAJE
+    def _end_betrayal(self, dt: float, living: list[Gladiator], alive_team_ids: set[int]) -> None:
+        if not self.betrayal_pending:
+            self.betrayal_pending = True
+            self.betrayal_timer = 3.0
+            self.clear_offers()
+            return
+        self.betrayal_timer = max(0.0, self.betrayal_timer - dt)
+        if self.betrayal_timer > 0:
+            return
+
+        # AGENT KOJI MOŽE IZDATI NA KRAJU BITKE
+        max_hp = max(g.hp for g in living)
+        eligible = [
+            g
+            for g in living
+            if g.hp == max_hp
+            and sum(1 for t in living if t.hp == max_hp) == 1
+            and not g.has_betrayed_end
+            and g.team_id not in self.betrayal_teams_done_end
+        ]
+        betrayers = [g for g in eligible if self.rng.random() < 0.50]
+        if betrayers:
+            for b in betrayers:
+                orig_team = b.team_id
+                b.team_id = None
+                b.last_team_change = self.clock.now
+                b.has_betrayed_end = True
+                if orig_team is not None:
+                    self.betrayal_teams_done_end.add(orig_team)
+        else:
+            self.finished = True
+            self._declare_team(next(iter(alive_team_ids)))
+        self.betrayal_pending = False
+        self.clear_offers()
+
+    def _declare_team(self, team_id: int) -> None:
+        self.winner_text = f"{team_label(team_id)} wins"
+        self.winner_team = team_id
+
+    # GLAVNI DIO PONAŠANJA GLADIJATORA
+    def _fight(self, dt: float) -> None:
+        intents = self.intents
+        now = self.clock.now
+        alive_names = set(self.registry.living)
+        by_name = self.registry.by_name
+        attackers_of: dict[str, list[Gladiator]] = {}
+        for name, entry in intents.items():
+            t = entry.get("time", 0)
+            if now - t >= 2.0:
+                continue
+            candidate = entry.get("data")
+            if (
+                candidate
+                and not candidate.get("action")
+                and candidate.get("attack")
+                and candidate.get("target") in alive_names
+                and name in by_name
+            ):
+                attackers_of.setdefault(candidate["target"], []).append(by_name[name])
+        self.grid.rebuild(self.gladiators)
+        for gladiator in self.gladiators:
+            intent_entry = intents.get(gladiator.name) if self.use_intents else None
+            intent = None
+            if intent_entry:
+                t = intent_entry.get("time", 0)
+                if now - t < 2.0:
+                    candidate = intent_entry.get("data")
+
+                    if candidate and candidate.get("action"):
+                        intent = None
+                    elif candidate and candidate.get("target") in alive_names:
+                        intent = candidate
+                else:
+                    intents.pop(gladiator.name, None)
+            gladiator.update(
+                dt,
+                self.gladiators,
+                allow_engage=self.engage_delay <= 0,
+                projectiles=self.projectiles,
+                intent=intent,
+                targeted_by=attackers_of.get(gladiator.name),
+                allow_shield=self.engage_delay <= 0 and not self.betrayal_pending,
+                grid=self.grid,
+            )
+        self.projectiles.update(dt)
+
+    # KONAČNI PODACI O GLADIJATORIMA
+    def stats(self) -> list[dict]:
+        rows = []
+        for g in self.gladiators:
+            if self.winner_team is not None:
+                won = g.team_id == self.winner_team
+            else:
+                won = g.name == self.winner_name
+            rows.append(
+                {
+                    "name": g.name,
+                    "class": g.class_type,
+                    "team": g.team_id,
+                    "alive": g.alive,
+                    "won": won,
+                    "hp": g.hp,
+                    "max_hp": g.max_hp,
+                    "armor": g.armor,
+                    "weapon": g.weapon.name,
+                    "weapon_range": g.weapon.range,
+                    "weapon_damage": g.weapon.damage,
+                    "weapon_cooldown": g.weapon.cooldown,
+                    "weapon_ranged": g.weapon.ranged,
+                    "betrayed_opp": g.has_betrayed_opp,
+                    "betrayed_end": g.has_betrayed_end,
+                }
+            )
+        return rows
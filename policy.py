@@ -0,0 +1,70 @@
+import random
+
+# ODLUČIVANJE AGENTA GLADIJATORA (BEZ OVISNOSTI O SPADE-U)
+class GladiatorPlanner:
+    def __init__(
+        self,
+        jid: str,
+        propose_chance: float = 0.15,
+        accept_chance: float = 0.25,
+        rng: random.Random | None = None,
+    ):
+        self.jid = jid
+        self.rng = rng if rng is not None else random.Random()
+        self.last_offer_time = 0.0
+        self.propose_chance = propose_chance
+        self.accept_chance = accept_chance
+
+    # NAMJERA AGENTA NA TEMELJU STANJA ARENE
+    def plan(self, data: dict, now: float) -> dict | None:
+        me = None
+        enemies = []
+        for g in data.get("gladiators", []):
+            if g.get("jid") == self.jid:
+                me = g
+            else:
+                enemies.append(g)
+        if not me or not enemies:
+            return None
+        negotiating = data.get("negotiating", False)
+        my_pos = me["pos"]
+        my_team = me.get("team")
+
+        if negotiating:
+            offers = data.get("offers", [])
+
+            for off in offers:
+                if off.get("to") == me["name"]:
+                    if self.rng.random() < self.accept_chance:
+                        return {"name": me["name"], "action": "accept", "target": off.get("from")}
+                    return {"name": me["name"], "action": "decline", "target": off.get("from")}
+
+            if now - self.last_offer_time > 1.0 and self.rng.random() < self.propose_chance:
+                candidates = [e for e in enemies if e.get("alive") and e.get("team") is None]
+                if candidates:
+                    target = self.rng.choice(candidates)
+                    self.last_offer_time = now
+                    return {"name": me["name"], "action": "offer", "target": target["name"]}
+            return None
+
+        filtered_enemies = [
+            e for e in enemies if e.get("alive") and (my_team is None or e.get("team") != my_team)
+        ]
+        if not filtered_enemies:
+            return None
+
+        def dist_sq(e):
+            dx = e["pos"][0] - my_pos[0]
+            dy = e["pos"][1] - my_pos[1]
+            return dx * dx + dy * dy
+
+        target = min(filtered_enemies, key=dist_sq)
+        dx = target["pos"][0] - my_pos[0]
+        dy = target["pos"][1] - my_pos[1]
+        attack = (dx * dx + dy * dy) ** 0.5 <= me["weapon_range"]
+        return {
+            "name": me["name"],
+            "move": [dx, dy],
+            "attack": attack,
+            "target": target["name"],
+        }
@@ -0,0 +1,236 @@
+from __future__ import annotations
+import heapq
+import math
+from typing import TYPE_CHECKING
+import numpy as np
+import pygame
+import settings
+
+if TYPE_CHECKING:
+    from entities import Gladiator
+    from simclock import SimClock
+
+PROJECTILE_RADIUS = 5
+EVENT_HIT, EVENT_EXIT = 0, 1
+
+# UNAPRIJED ALOCIRANI SPREMNIK PROJEKTILA S LISTOM SLOBODNIH MJESTA
+class ProjectilePool:
+    def __init__(self, capacity: int = 64, clock: "SimClock | None" = None, analytic: bool = False):
+        self.clock = clock
+        self.analytic = analytic and clock is not None
+        self.replan_speed = settings.PROJECTILE_REPLAN_SPEED
+        self.events: list[tuple[float, int, int, int]] = []
+        # META -> MJESTA PROJEKTILA KOJI JOJ LETE (SAMO ANALITIČKI NAČIN)
+        self.incoming: dict[Gladiator, set[int]] = {}
+        self.target_plan: dict[Gladiator, tuple[float, float]] = {}
+        self.capacity = 0
+        self.pos = np.zeros((0, 2), dtype=np.float64)
+        self.prev_pos = np.zeros((0, 2), dtype=np.float64)
+        self.vel = np.zeros((0, 2), dtype=np.float64)
+        self.damage = np.zeros(0, dtype=np.int32)
+        self.active = np.zeros(0, dtype=bool)
+        self.origin = np.zeros((0, 2), dtype=np.float64)
+        self.launch_time = np.zeros(0, dtype=np.float64)
+        self.plan = np.zeros(0, dtype=np.int64)
+        self.owner: list[Gladiator | None] = []
+        self.target: list[Gladiator | None] = []
+        self.free: list[int] = []
+        self.count = 0
+        self.high_water = 0
+        self._grow(max(1, capacity))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _grow(self, capacity: int) -> None:
+        old = self.capacity
+        for name in ("pos", "prev_pos", "vel", "damage", "active", "origin", "launch_time", "plan"):
+            arr = getattr(self, name)
+            grown = np.zeros((capacity,) + arr.shape[1:], dtype=arr.dtype)
+            grown[:old] = arr
+            setattr(self, name, grown)
+        self.owner.extend([None] * (capacity - old))
+        self.target.extend([None] * (capacity - old))
+        # NIŽI INDEKSI NA VRHU STOGA DA ŽIVI PROJEKTILI OSTANU ZBIJENI
+        self.free.extend(range(capacity - 1, old - 1, -1))
+        self.capacity = capacity
+
+    def spawn(self, position: pygame.Vector2, velocity: pygame.Vector2, damage: int, owner: "Gladiator", target: "Gladiator") -> None:
+        if not self.free:
+            self._grow(self.capacity * 2)
+        slot = self.free.pop()
+        self.pos[slot] = (position.x, position.y)
+        self.prev_pos[slot] = self.pos[slot]
+        self.vel[slot] = (velocity.x, velocity.y)
+        self.damage[slot] = damage
+        self.active[slot] = True
+        self.owner[slot] = owner
+        self.target[slot] = target
+        self.count += 1
+        self.high_water = max(self.high_water, self.count)
+        if self.analytic:
+            self.incoming.setdefault(target, set()).add(slot)
+            self._replan(slot, position.x, position.y)
+
+    def _release(self, slots: np.ndarray) -> None:
+        for slot in slots.tolist():
+            if self.analytic:
+                self._forget(slot)
+            self.active[slot] = False
+            self.owner[slot] = None
+            self.target[slot] = None
+            self.free.append(slot)
+        self.count -= slots.size
+
+    def _forget(self, slot: int) -> None:
+        target = self.target[slot]
+        slots = self.incoming.get(target)
+        if slots is None:
+            return
+        slots.discard(slot)
+        if not slots:
+            del self.incoming[target]
+            self.target_plan.pop(target, None)
+
+    def clear(self) -> None:
+        self._release(np.flatnonzero(self.active))
+        self.events.clear()
+
+    # JEDAN PROLAZ PO TICKU ZA SVE ŽIVE PROJEKTILE
+    def update(self, dt: float) -> None:
+        if not self.count:
+            return
+        if self.analytic:
+            self._update_analytic()
+            return
+        live = np.flatnonzero(self.active)
+        self.prev_pos[live] = self.pos[live]
+        pos = self.pos[live] + self.vel[live] * dt
+        self.pos[live] = pos
+        targets = [self.target[slot] for slot in live.tolist()]
+        target_pos = np.array([(t.position.x, t.position.y) for t in targets], dtype=np.float64)
+        target_radius = np.array([t.radius for t in targets], dtype=np.float64)
+        target_alive = np.array([t.alive for t in targets], dtype=bool)
+
+        d = target_pos - pos
+        hit = target_alive & (np.hypot(d[:, 0], d[:, 1]) <= PROJECTILE_RADIUS + target_radius)
+        off = pos - (settings.ARENA_CENTER.x, settings.ARENA_CENTER.y)
+        outside = np.hypot(off[:, 0], off[:, 1]) > settings.ARENA_RADIUS + 50
+
+        # POGOCI REDOM PO MJESTU; META UBIJENA RANIJIM POGOTKOM SE PRESKAČE
+        for i in np.flatnonzero(hit).tolist():
+            target = targets[i]
+            if not target.alive:
+                continue
+            self._hit(live[i])
+        self._release(live[~target_alive | hit | outside])
+
+    def _hit(self, slot: int) -> None:
+        target = self.target[slot]
+        owner = self.owner[slot]
+        raw_damage = int(self.damage[slot]) + owner.rng.randint(-3, 3)
+        mitigated = max(1, int(raw_damage - target.armor * 0.25))
+        target.apply_damage(mitigated, owner)
+
+    # ANALITIČKI NAČIN: VRIJEME POGOTKA ILI IZLASKA IZ ARENE U REDU PRIORITETA
+    def _replan(self, slot: int, px: float, py: float) -> None:
+        now = self.clock.now
+        target = self.target[slot]
+        vx, vy = self.vel[slot]
+        tvx, tvy = target.steer_x, target.steer_y
+        self.origin[slot] = (px, py)
+        self.launch_time[slot] = now
+        self.target_plan[target] = (tvx, tvy)
+        self.plan[slot] += 1
+
+        # |d + w t| = R, RELATIVNO GIBANJE PROJEKTILA PREMA META
+        dx, dy = px - target.position.x, py - target.position.y
+        wx, wy = vx - tvx, vy - tvy
+        reach = PROJECTILE_RADIUS + target.radius
+        when, kind = _first_contact(dx, dy, wx, wy, reach), EVENT_HIT
+
+        # |e + v t| = L, IZLAZAK IZ ARENE
+        ex, ey = px - settings.ARENA_CENTER.x, py - settings.ARENA_CENTER.y
+        limit = settings.ARENA_RADIUS + 50
+        if ex * ex + ey * ey > limit * limit:
+            exit_after = 0.0
+        else:
+            a = vx * vx + vy * vy
+            b = 2 * (ex * vx + ey * vy)
+            c = ex * ex + ey * ey - limit * limit
+            exit_after = (-b + math.sqrt(b * b - 4 * a * c)) / (2 * a) if a > 0 else math.inf
+        if when is None or exit_after < when:
+            when, kind = exit_after, EVENT_EXIT
+        if when != math.inf:
+            heapq.heappush(self.events, (now + when, slot, int(self.plan[slot]), kind))
+
+    # POZIVA GLADIJATOR KAD MU SE BRZINA BEZ TRZANJA ZNAČAJNO PROMIJENI
+    def target_steered(self, target: "Gladiator") -> None:
+        plan_x, plan_y = self.target_plan[target]
+        if math.hypot(target.steer_x - plan_x, target.steer_y - plan_y) <= self.replan_speed:
+            return
+        now = self.clock.now
+        for slot in self.incoming[target]:
+            # POZICIJA U TRENUTKU NOVOG PLANA; pos I prev_pos (INTERPOLACIJA CRTANJA) OSVJEŽAVA _update_analytic
+            px, py = self.origin[slot] + self.vel[slot] * (now - self.launch_time[slot])
+            self._replan(slot, px, py)
+
+    # POZIVA MRTVI GLADIJATOR; NJEGOVI PROJEKTILI NESTAJU KAO U KORAČNOM NAČINU
+    def drop_target(self, target: "Gladiator") -> None:
+        self._release(np.fromiter(self.incoming[target], dtype=np.int64))
+
+    # POGOCI I IZLASCI IZ REDA PRIORITETA; POZICIJE SE RAČUNAJU SAMO ZA CRTANJE
+    def _update_analytic(self) -> None:
+        now = self.clock.now
+        events = self.events
+        while events and events[0][0] <= now:
+            _, slot, plan, kind = heapq.heappop(events)
+            if not self.active[slot] or self.plan[slot] != plan:
+                continue
+            if kind == EVENT_HIT and self.target[slot].alive:
+                self._hit(slot)
+            self._release(np.array([slot]))
+
+        live = np.flatnonzero(self.active)
+        self.prev_pos[live] = self.pos[live]
+        self.pos[live] = self.origin[live] + self.vel[live] * (now - self.launch_time[live])[:, None]
+
+    # SKALIRANJE POZICIJA NAKON PROMJENE VELIČINE ARENE
+    def rescale(self, old_center: pygame.Vector2, new_center: pygame.Vector2, scale: float) -> None:
+        live = self.active
+        self.pos[live] = (self.pos[live] - (old_center.x, old_center.y)) * scale + (new_center.x, new_center.y)
+        self.prev_pos[live] = self.pos[live]
+        if self.analytic:
+            for slot in np.flatnonzero(live).tolist():
+                self._replan(slot, *self.pos[slot])
+
+    def draw(self, surface: pygame.Surface) -> list[pygame.Rect]:
+        live = self.active
+        if not self.count:
+            return []
+        vel = self.vel[live]
+        pos = self.pos[live]
+        speed = np.hypot(vel[:, 0], vel[:, 1])
+        unit = np.divide(vel, speed[:, None], out=np.zeros_like(vel), where=speed[:, None] > 0)
+        tips = pos + unit * 10
+        tails = pos - unit * 6
+        dirty = []
+        for tail, tip, moving in zip(tails.tolist(), tips.tolist(), (speed > 0).tolist()):
+            if moving:
+                dirty.append(pygame.draw.line(surface, (10, 10, 10), tail, tip, width=2))
+            else:
+                dirty.append(pygame.draw.circle(surface, (10, 10, 10), tail, 3))
+        return dirty
+
+
+# NAJRANIJE t >= 0 ZA KOJE JE |d + w t| <= R (None AKO DO DODIRA NE DOLAZI)
+def _first_contact(dx: float, dy: float, wx: float, wy: float, reach: float) -> float | None:
+    c = dx * dx + dy * dy - reach * reach
+    if c <= 0:
+        return 0.0
+    a = wx * wx + wy * wy
+    b = 2 * (dx * wx + dy * wy)
+    disc = b * b - 4 * a * c
+    if a == 0 or disc < 0 or b >= 0:
+        return None
+    return (-b - math.sqrt(disc)) / (2 * a)
@@ -0,0 +1,119 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+if TYPE_CHECKING:
+    from entities import Gladiator
+
+# INKREMENTALNA STATISTIKA JEDNOG TIMA (ŽIVI ČLANOVI)
+class TeamStats:
+    __slots__ = ("team_id", "members", "min_hp_ratio")
+
+    def __init__(self, team_id: int):
+        self.team_id = team_id
+        self.members: dict[str, Gladiator] = {}
+        self.min_hp_ratio = 1.0
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+    def roster(self) -> list[str]:
+        return list(self.members)
+
+    def add(self, gladiator: "Gladiator") -> None:
+        self.members[gladiator.name] = gladiator
+        self.min_hp_ratio = min(self.min_hp_ratio, _hp_ratio(gladiator))
+
+    def remove(self, gladiator: "Gladiator") -> None:
+        self.members.pop(gladiator.name, None)
+        self.refresh()
+
+    # TIM IMA NAJVIŠE TRI ČLANA PA JE PONOVNI IZRAČUN KONSTANTAN
+    def refresh(self) -> None:
+        self.min_hp_ratio = min((_hp_ratio(g) for g in self.members.values()), default=1.0)
+
+
+def _hp_ratio(gladiator: "Gladiator") -> float:
+    return gladiator.hp / max(1, gladiator.max_hp)
+
+# REGISTAR GLADIJATORA S INDEKSIMA PO IMENU, ŽIVIMA I TIMOVIMA
+class GladiatorRegistry:
+    def __init__(self, gladiators: Iterable["Gladiator"] = ()):
+        self.all: list[Gladiator] = []
+        self.by_name: dict[str, Gladiator] = {}
+        self.living: dict[str, Gladiator] = {}
+        self.solo: dict[str, Gladiator] = {}
+        self.teams: dict[int, TeamStats] = {}
+        for g in gladiators:
+            self.add(g)
+
+    def __iter__(self) -> Iterator["Gladiator"]:
+        return iter(self.all)
+
+    def __len__(self) -> int:
+        return len(self.all)
+
+    def add(self, gladiator: "Gladiator") -> None:
+        self.all.append(gladiator)
+        self.by_name[gladiator.name] = gladiator
+        gladiator.registry = self
+        if gladiator.alive:
+            self.on_revive(gladiator)
+
+    def get(self, name: str | None) -> "Gladiator | None":
+        return self.by_name.get(name)
+
+    def get_living(self, name: str | None) -> "Gladiator | None":
+        return self.living.get(name)
+
+    def team_size(self, team_id: int | None) -> int:
+        if team_id is None:
+            return 0
+        return len(self.teams.get(team_id, ()))
+
+    def team_counts(self) -> dict[int, int]:
+        return {team_id: len(stats) for team_id, stats in self.teams.items()}
+
+    def team_low(self, team_id: int | None, threshold: float) -> bool:
+        stats = self.teams.get(team_id)
+        return stats is not None and stats.min_hp_ratio < threshold
+
+    def any_team_low(self, threshold: float) -> bool:
+        return any(stats.min_hp_ratio < threshold for stats in self.teams.values())
+
+    def _join(self, gladiator: "Gladiator", team_id: int | None) -> None:
+        if team_id is None:
+            self.solo[gladiator.name] = gladiator
+        else:
+            stats = self.teams.get(team_id)
+            if stats is None:
+                stats = self.teams[team_id] = TeamStats(team_id)
+            stats.add(gladiator)
+
+    def _leave(self, gladiator: "Gladiator", team_id: int | None) -> None:
+        if team_id is None:
+            self.solo.pop(gladiator.name, None)
+            return
+        stats = self.teams.get(team_id)
+        if stats is not None:
+            stats.remove(gladiator)
+            if not stats:
+                del self.teams[team_id]
+
+    # POZIVA GLADIJATOR PRI PROMJENI ŽIVOTA, SMRTI, OŽIVLJAVANJU I PROMJENI TIMA
+    def on_hp_change(self, gladiator: "Gladiator") -> None:
+        stats = self.teams.get(gladiator.team_id)
+        if stats is not None and gladiator.name in stats.members:
+            stats.refresh()
+
+    def on_death(self, gladiator: "Gladiator") -> None:
+        self.living.pop(gladiator.name, None)
+        self._leave(gladiator, gladiator.team_id)
+
+    def on_revive(self, gladiator: "Gladiator") -> None:
+        self.living[gladiator.name] = gladiator
+        self._join(gladiator, gladiator.team_id)
+
+    def on_team_change(self, gladiator: "Gladiator", old_team: int | None, new_team: int | None) -> None:
+        if gladiator.alive:
+            self._leave(gladiator, old_team)
+            self._join(gladiator, new_team)
@@ -0,0 +1,127 @@
+import pygame
+import settings
+
+# ISCRTAVANJE SAMO PROMIJENJENIH PODRUČJA EKRANA
+class DirtyRectRenderer:
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.previous: list[pygame.Rect] = []
+        self.full = True
+
+    # SLJEDEĆI OKVIR SE CRTA I PRIKAZUJE CIJELI (RESIZE, LOADING EKRAN)
+    def invalidate(self) -> None:
+        self.full = True
+
+    def begin(self, screen: pygame.Surface, layer: pygame.Surface) -> None:
+        if self.full or not self.enabled:
+            screen.blit(layer, (0, 0))
+            return
+        for rect in self.previous:
+            screen.blit(layer, rect, rect)
+
+    def end(self, screen: pygame.Surface, rects: list[pygame.Rect | None]) -> None:
+        bounds = screen.get_rect()
+        current = [bounds.clip(rect) for rect in rects if rect]
+        if self.full or not self.enabled:
+            pygame.display.flip()
+            self.full = False
+        else:
+            pygame.display.update(self.previous + current)
+        self.previous = current
+
+# RAZINE DETALJA PRIKAZA GLADIJATORA
+LOD_FULL, LOD_SPRITES, LOD_DOTS = 0, 1, 2
+HP_BAR_STEPS = 20
+
+_bar_cache: dict[tuple, pygame.Surface] = {}
+_dot_cache: dict[tuple, pygame.Surface] = {}
+
+def choose_lod(count: int, sprite_px: int) -> int:
+    if count > settings.LOD_DOT_COUNT or sprite_px < settings.LOD_MIN_SPRITE_PX:
+        return LOD_DOTS
+    if count > settings.LOD_LABEL_COUNT:
+        return LOD_SPRITES
+    return LOD_FULL
+
+def _hp_bar(width: int, height: int, step: int, shielded: bool) -> pygame.Surface:
+    key = (width, height, step, shielded)
+    bar = _bar_cache.get(key)
+    if bar is None:
+        ratio = step / HP_BAR_STEPS
+        color = (30, 200, 80) if ratio >= 0.66 else (230, 160, 60) if ratio >= 0.33 else (210, 60, 60)
+        if shielded:
+            gray = int(0.3 * color[0] + 0.59 * color[1] + 0.11 * color[2])
+            color = (gray, gray, gray)
+        bar = pygame.Surface((width, height))
+        bar.fill((35, 35, 35))
+        bar.fill(color, (0, 0, round(width * ratio), height))
+        _bar_cache[key] = bar
+    return bar
+
+def _dot(radius: int, color: tuple[int, int, int]) -> pygame.Surface:
+    key = (radius, color)
+    dot = _dot_cache.get(key)
+    if dot is None:
+        dot = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(dot, color, (radius, radius), radius)
+        _dot_cache[key] = dot
+    return dot
+
+def team_color(team_id: int | None) -> tuple[int, int, int]:
+    if not team_id:
+        return settings.LOD_SOLO_COLOR
+    return settings.LOD_TEAM_COLORS[(team_id - 1) % len(settings.LOD_TEAM_COLORS)]
+
+# CRTANJE SVIH GLADIJATORA PREMA RAZINI DETALJA
+def draw_gladiators(
+    surface: pygame.Surface,
+    gladiators: list,
+    font: pygame.font.Font,
+    textures: dict[str, pygame.Surface],
+    dead_textures: dict[str, pygame.Surface],
+) -> list[pygame.Rect]:
+    sprite_px = next(iter(textures.values())).get_width() if textures else 0
+    lod = choose_lod(len(gladiators), sprite_px)
+    if lod == LOD_FULL:
+        return [
+            g.draw(
+                surface,
+                font,
+                textures["Fighter"],
+                textures["Tank"],
+                textures["Archer"],
+                dead_textures["Fighter"],
+                dead_textures["Tank"],
+                dead_textures["Archer"],
+            )
+            for g in gladiators
+        ]
+
+    if lod == LOD_DOTS:
+        radius = max(2, settings.LOD_DOT_RADIUS)
+        dead = _dot(radius, settings.LOD_DEAD_COLOR)
+        sequence = []
+        for g in gladiators:
+            dot = _dot(radius, team_color(g.team_id)) if g.alive else dead
+            sequence.append((dot, (g.position.x - radius, g.position.y - radius)))
+        return surface.blits(sequence)
+
+    # SPRITEOVI BEZ LABELA; TRAKE ŽIVOTA I OZNAKE TIMA U ISTOM SKUPNOM BLITU
+    half = sprite_px / 2
+    sequence = []
+    for g in gladiators:
+        if g.alive:
+            sequence.append((textures.get(g.class_type, textures["Archer"]), (g.position.x - half, g.position.y - half)))
+        else:
+            sequence.append((dead_textures.get(g.class_type, dead_textures["Archer"]), (g.position.x - half, g.position.y - half)))
+    for g in gladiators:
+        if not g.alive:
+            continue
+        bar_width = int(g.radius * 2.6)
+        bar_x = g.position.x - bar_width / 2
+        bar_y = g.position.y - g.radius - 12
+        step = max(0, min(HP_BAR_STEPS, round(HP_BAR_STEPS * g.hp / max(1, g.max_hp))))
+        sequence.append((_hp_bar(bar_width, 5, step, g.shield_active), (bar_x, bar_y)))
+        if g.team_id:
+            sequence.append((_dot(4, team_color(g.team_id)), (bar_x + bar_width + 3, bar_y - 1)))
+    return surface.blits(sequence)
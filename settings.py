@@ -1,4 +1,6 @@
 import pygame
+from assets import ASSETS
+from textcache import render_text
 
 SCREEN_WIDTH = 1920
 SCREEN_HEIGHT = 1080
@@ -8,6 +10,31 @@ FPS = 60
 ARENA_RADIUS = min(SCREEN_WIDTH, SCREEN_HEIGHT) // 2 - 80
 ARENA_CENTER = pygame.Vector2(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
 GLADIATOR_COUNT = 16
+GRID_CELL_SIZE = 64
+FLEE_RADIUS = 360
+FLEE_NEIGHBOURS = 8
+DIRTY_RECT_RENDERING = True
+SIM_TICK_RATE = 60
+SIM_MAX_LAG = 0.25
+SIM_MAX_SUBSTEPS = 8
+ANALYTIC_PROJECTILES = False
+PROJECTILE_REPLAN_SPEED = 25.0
+DELTA_STATE_MESSAGES = False
+STATE_KEYFRAME_INTERVAL = 10
+PERCEPTION_VIEWS = True
+PERCEPTION_RADIUS = 320
+PERCEPTION_MAX_ENEMIES = 8
+PERCEPTION_VIEW_INTERVAL = 0.25
+# ZAPIS PORUKA BIRA ARENA; AGENTI ODGOVARAJU U ZAPISU U KOJEM JE STANJE STIGLO (BEZ RAZMJENE MOGUĆNOSTI)
+AGENT_MESSAGE_FORMAT = "application/json"
+AGENT_TRANSPORT = "xmpp"
+LOD_LABEL_COUNT = 120
+LOD_DOT_COUNT = 600
+LOD_MIN_SPRITE_PX = 12
+LOD_DOT_RADIUS = 6
+LOD_TEAM_COLORS = [(40, 90, 200), (200, 50, 50), (40, 160, 70), (220, 180, 30)]
+LOD_SOLO_COLOR = (235, 235, 235)
+LOD_DEAD_COLOR = (70, 70, 70)
 WALL_TEXTURE_PATH = "art/walls.png"
 WALL_TEXTURE_SCALE = 0.1
 SAND_TEXTURE_PATH = "art/sand.png"
@@ -26,6 +53,19 @@ TIMER_BG_TEXTURE_PATH = "art/wood.png"
 TIMER_BG_DARKEN = 0.85
 _timer_bg_texture: pygame.Surface | None = None
 
+# SAŽETO STANJE JEDNOG GLADIJATORA
+def gladiator_state(g) -> dict:
+    return {
+        "name": g.name,
+        "jid": f"{g.name.lower()}@localhost",
+        "pos": [g.position.x, g.position.y],
+        "hp": g.hp,
+        "armor": g.armor,
+        "weapon_range": g.weapon.range,
+        "alive": g.alive,
+        "team": g.team_id,
+    }
+
 # IZGRADNJA SAŽETOG STANJA SIMULACIJE
 def build_state(
     gladiators,
@@ -42,19 +82,7 @@ def build_state(
         "negotiation_time_left": negotiation_time_left,
         "offers": [{"from": v, "to": k} for k, v in offers.items()],
         "offer_visuals": visuals,
-        "gladiators": [
-            {
-                "name": g.name,
-                "jid": f"{g.name.lower()}@localhost",
-                "pos": [g.position.x, g.position.y],
-                "hp": g.hp,
-                "armor": g.armor,
-                "weapon_range": g.weapon.range,
-                "alive": g.alive,
-                "team": g.team_id,
-            }
-            for g in gladiators
-        ],
+        "gladiators": [gladiator_state(g) for g in gladiators],
         "arena": {
             "center": [ARENA_CENTER.x, ARENA_CENTER.y],
             "radius": ARENA_RADIUS,
@@ -62,8 +90,8 @@ def build_state(
     }
 
 # CRTANJE TIMERA SIMULACIJE
-def draw_timer(surface: pygame.Surface, font: pygame.font.Font, elapsed: float) -> None:
-    timer_text = font.render(TIMER_TEXT_FORMAT.format(elapsed=elapsed).upper(), True, TIMER_TEXT_COLOR)
+def draw_timer(surface: pygame.Surface, font: pygame.font.Font, elapsed: float) -> pygame.Rect:
+    timer_text = render_text(font, TIMER_TEXT_FORMAT.format(elapsed=elapsed).upper(), TIMER_TEXT_COLOR)
     timer_rect = timer_text.get_rect(center=(SCREEN_WIDTH // 2, 40))
     padding_x = 18
     padding_y = 12
@@ -75,6 +103,25 @@ def draw_timer(surface: pygame.Surface, font: pygame.font.Font, elapsed: float)
     )
     draw_wood_panel(surface, bg_rect, radius=10)
     surface.blit(timer_text, timer_rect)
+    return bg_rect
+
+# GOTOVE DRVENE PLOČE PO (ŠIRINA, VISINA, RADIJUS, ZATAMNJENJE)
+_wood_panels: dict[tuple[int, int, int, float], pygame.Surface] = {}
+
+def _build_wood_panel(width: int, height: int, radius: int) -> pygame.Surface:
+    tex = pygame.transform.smoothscale(_timer_bg_texture, (width, height))
+    if TIMER_BG_DARKEN < 1.0:
+        level = max(0, min(255, int(255 * TIMER_BG_DARKEN)))
+        tex.fill((level, level, level, 255), special_flags=pygame.BLEND_RGBA_MULT)
+    rounded = pygame.Surface((width, height), pygame.SRCALPHA)
+    rounded.blit(tex, (0, 0))
+    mask = pygame.Surface((width, height), pygame.SRCALPHA)
+    pygame.draw.rect(mask, (255, 255, 255, 255), mask.get_rect(), border_radius=radius)
+    rounded.blit(mask, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+    return rounded
+
+def clear_wood_panels() -> None:
+    _wood_panels.clear()
 
 # CRTANJE POZADINE GRAFIČKOG SUČELJA
 def draw_wood_panel(surface: pygame.Surface, rect: pygame.Rect, radius: int = 10) -> None:
@@ -86,15 +133,11 @@ def draw_wood_panel(surface: pygame.Surface, rect: pygame.Rect, radius: int = 10
             except Exception:
                 _timer_bg_texture = None
         if _timer_bg_texture is not None:
-            tex = pygame.transform.smoothscale(_timer_bg_texture, (rect.width, rect.height))
-            if TIMER_BG_DARKEN < 1.0:
-                level = max(0, min(255, int(255 * TIMER_BG_DARKEN)))
-                tex.fill((level, level, level, 255), special_flags=pygame.BLEND_RGBA_MULT)
-            rounded = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
-            rounded.blit(tex, (0, 0))
-            mask = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
-            pygame.draw.rect(mask, (255, 255, 255, 255), mask.get_rect(), border_radius=radius)
-            rounded.blit(mask, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+            key = (rect.width, rect.height, radius, TIMER_BG_DARKEN)
+            rounded = _wood_panels.get(key)
+            if rounded is None:
+                rounded = _build_wood_panel(rect.width, rect.height, radius)
+                _wood_panels[key] = rounded
             surface.blit(rounded, (rect.x, rect.y))
             return
     pygame.draw.rect(surface, (0, 0, 0), rect, border_radius=radius)
@@ -102,16 +145,11 @@ def draw_wood_panel(surface: pygame.Surface, rect: pygame.Rect, radius: int = 10
 # UČITAVANJE LOADING EKRANA IZMEĐU SCENA
 def render_loading(surface: pygame.Surface, font: pygame.font.Font, dots: int, label: str) -> None:
     try:
-        bg = pygame.image.load("art/loading.png").convert()
-        bg = pygame.transform.smoothscale(bg, (SCREEN_WIDTH, SCREEN_HEIGHT))
-        surface.blit(bg, (0, 0))
+        surface.blit(ASSETS.scaled("art/loading.png", (SCREEN_WIDTH, SCREEN_HEIGHT)), (0, 0))
     except Exception:
         surface.fill((0, 0, 0))
     msg = (label + "." * dots).upper()
-    prev_bold = font.get_bold()
-    font.set_bold(True)
-    text = font.render(msg, True, (0, 0, 0))
-    font.set_bold(prev_bold)
+    text = render_text(font, msg, (0, 0, 0), bold=True)
     rect = text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 200))
     surface.blit(text, rect)
     pygame.display.flip()
\ No newline at end of file
@@ -0,0 +1,24 @@
+import heapq
+from typing import Callable
+
+# SIMULACIJSKI SAT NEOVISAN O STVARNOM VREMENU
+class SimClock:
+    def __init__(self, start: float = 0.0):
+        self.now = start
+        self.events: list[tuple[float, int, Callable[[], None]]] = []
+        self._seq = 0
+
+    # ROKOVI NA SATU: POZIV SE IZVRŠAVA TEK KADA DOSPIJE
+    def schedule(self, at: float, callback: Callable[[], None]) -> None:
+        heapq.heappush(self.events, (at, self._seq, callback))
+        self._seq += 1
+
+    def advance(self, dt: float) -> float:
+        self.now += dt
+        events = self.events
+        while events and events[0][0] <= self.now:
+            heapq.heappop(events)[2]()
+        return self.now
+
+    def __call__(self) -> float:
+        return self.now
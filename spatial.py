@@ -0,0 +1,184 @@
+from __future__ import annotations
+import math
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator
+import pygame
+import settings
+
+if TYPE_CHECKING:
+    from entities import Gladiator
+
+# UNIFORMNA PROSTORNA MREŽA ZA UPITE O SUSJEDIMA
+class SpatialGrid:
+    def __init__(self, cell_size: float | None = None):
+        self.cell_size = float(cell_size or settings.GRID_CELL_SIZE)
+        self.cells: dict[tuple[int, int], list["Gladiator"]] = {}
+        self.count = 0
+        self.max_reach = 0.0
+        self.min_cell = (0, 0)
+        self.max_cell = (-1, -1)
+
+    def _cell_of(self, x: float, y: float) -> tuple[int, int]:
+        size = self.cell_size
+        return int(math.floor(x / size)), int(math.floor(y / size))
+
+    # PONOVNA IZGRADNJA MREŽE JEDNOM PO KORAKU SIMULACIJE
+    def rebuild(self, gladiators: Iterable["Gladiator"]) -> None:
+        cells = self.cells
+        cells.clear()
+        size = self.cell_size
+        count = 0
+        reach = 0.0
+        min_x = min_y = math.inf
+        max_x = max_y = -math.inf
+        for g in gladiators:
+            if not g.alive:
+                continue
+            cx = int(math.floor(g.position.x / size))
+            cy = int(math.floor(g.position.y / size))
+            bucket = cells.get((cx, cy))
+            if bucket is None:
+                cells[(cx, cy)] = [g]
+            else:
+                bucket.append(g)
+            count += 1
+            if g.weapon.range > reach:
+                reach = g.weapon.range
+            min_x = min(min_x, cx)
+            min_y = min(min_y, cy)
+            max_x = max(max_x, cx)
+            max_y = max(max_y, cy)
+        self.count = count
+        self.max_reach = reach
+        if count:
+            self.min_cell = (min_x, min_y)
+            self.max_cell = (max_x, max_y)
+        else:
+            self.min_cell = (0, 0)
+            self.max_cell = (-1, -1)
+
+    # KANDIDATI UNUTAR ZADANOG RADIJUSA
+    def query(self, position: pygame.Vector2, radius: float) -> Iterator["Gladiator"]:
+        if not self.count:
+            return
+        x0, y0 = self._cell_of(position.x - radius, position.y - radius)
+        x1, y1 = self._cell_of(position.x + radius, position.y + radius)
+        x0 = max(x0, self.min_cell[0])
+        y0 = max(y0, self.min_cell[1])
+        x1 = min(x1, self.max_cell[0])
+        y1 = min(y1, self.max_cell[1])
+        cells = self.cells
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    yield from bucket
+
+    # NAJBLIŽI GLADIJATOR KOJI ZADOVOLJAVA UVJET
+    def nearest(self, position: pygame.Vector2, accept: Callable[["Gladiator"], bool]) -> "Gladiator | None":
+        if not self.count:
+            return None
+        cx, cy = self._cell_of(position.x, position.y)
+        max_ring = max(
+            cx - self.min_cell[0],
+            self.max_cell[0] - cx,
+            cy - self.min_cell[1],
+            self.max_cell[1] - cy,
+        )
+        best = None
+        best_dist = math.inf
+        ring = 0
+        while ring <= max_ring:
+            if best is not None and (ring - 1) * self.cell_size > best_dist:
+                break
+            if 8 * ring > len(self.cells):
+                return self._nearest_scan(position, accept)
+            for g in self._ring(cx, cy, ring):
+                if not accept(g):
+                    continue
+                dist = position.distance_to(g.position)
+                if dist < best_dist:
+                    best = g
+                    best_dist = dist
+            ring += 1
+        return best
+
+    # NAJBLIŽIH k (UDALJENOST, GLADIJATOR) UNUTAR RADIJUSA; PRSTENOVI SE PREKIDAJU KAD SU DALJI OD k-TOG
+    def nearest_k(
+        self,
+        position: pygame.Vector2,
+        k: int,
+        radius: float,
+        accept: Callable[["Gladiator"], bool],
+    ) -> list[tuple[float, "Gladiator"]]:
+        found: list[tuple[float, "Gladiator"]] = []
+        if not self.count or k <= 0:
+            return found
+        size = self.cell_size
+        px = position.x
+        py = position.y
+        cx, cy = self._cell_of(px, py)
+        max_ring = min(
+            int(math.ceil(radius / size)),
+            max(cx - self.min_cell[0], self.max_cell[0] - cx, cy - self.min_cell[1], self.max_cell[1] - cy),
+        )
+        # RIJETKO NASELJENA MREŽA: MANJE GLADIJATORA NEGO ĆELIJA U PRSTENOVIMA
+        if self.count < (2 * max_ring + 1) ** 2:
+            limit = radius * radius
+            for bucket in self.cells.values():
+                for g in bucket:
+                    dx = px - g.position.x
+                    dy = py - g.position.y
+                    if dx * dx + dy * dy <= limit and accept(g):
+                        found.append((math.hypot(dx, dy), g))
+            found.sort(key=_distance)
+            del found[k:]
+            return found
+        ring = 0
+        while ring <= max_ring:
+            if len(found) >= k and (ring - 1) * size > found[k - 1][0]:
+                break
+            for g in self._ring(cx, cy, ring):
+                if not accept(g):
+                    continue
+                dist = math.hypot(px - g.position.x, py - g.position.y)
+                if dist <= radius:
+                    found.append((dist, g))
+            if len(found) > 1:
+                found.sort(key=_distance)
+                del found[k:]
+            ring += 1
+        return found
+
+    def _nearest_scan(self, position: pygame.Vector2, accept: Callable[["Gladiator"], bool]) -> "Gladiator | None":
+        best = None
+        best_dist = math.inf
+        for bucket in self.cells.values():
+            for g in bucket:
+                if not accept(g):
+                    continue
+                dist = position.distance_to(g.position)
+                if dist < best_dist:
+                    best = g
+                    best_dist = dist
+        return best
+
+    def _ring(self, cx: int, cy: int, ring: int) -> Iterator["Gladiator"]:
+        cells = self.cells
+        if ring == 0:
+            bucket = cells.get((cx, cy))
+            if bucket:
+                yield from bucket
+            return
+        for x in range(cx - ring, cx + ring + 1):
+            for y in (cy - ring, cy + ring):
+                bucket = cells.get((x, y))
+                if bucket:
+                    yield from bucket
+        for y in range(cy - ring + 1, cy + ring):
+            for x in (cx - ring, cx + ring):
+                bucket = cells.get((x, y))
+                if bucket:
+                    yield from bucket
+
+def _distance(entry: tuple[float, "Gladiator"]) -> float:
+    return entry[0]
@@ -0,0 +1,81 @@
+import os
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import math
+import sys
+import unittest
+import settings
+from arena import recalc_arena
+from entities import Gladiator
+from match import Match
+
+COUNTS = (50, 200, 400)
+ARENA_RADIUS_PER_ROOT = 60
+BLOCKS_PER_UPDATE_LIMIT = 8
+BLOCKS_PER_UPDATE_SPREAD = 2.0
+
+# BROJ NOVIH BLOKOVA PO POZIVU Gladiator.update (UKLJUČUJUĆI PRIVREMENE OBJEKTE)
+# PRAĆENJE PO INSTRUKCIJI: PRIVREMENI OBJEKT SE BROJI I AKO GA ISTI RED ODMAH OSLOBODI
+def blocks_per_update(count: int, ticks: int = 2, warmup: int = 20, seed: int = 1) -> float:
+    radius = ARENA_RADIUS_PER_ROOT * math.sqrt(count)
+    recalc_arena(int(radius * 2 + 280), int(radius * 2 + 280))
+    match = Match(count, seed=seed)
+    match.use_intents = False
+    match.begin(0.0)
+    for _ in range(warmup):
+        match.step(1 / 60)
+
+    blocks = sys.getallocatedblocks
+    state = {"new": 0, "last": 0}
+
+    def tracer(frame, event, arg):
+        now = blocks()
+        if now > state["last"]:
+            state["new"] += now - state["last"]
+        if event == "call":
+            frame.f_trace_opcodes = True
+        state["last"] = blocks()
+        return tracer
+
+    update = Gladiator.update
+    calls = []
+
+    def traced(self, *args, **kwargs):
+        state["new"] = 0
+        state["last"] = blocks()
+        sys.settrace(tracer)
+        try:
+            update(self, *args, **kwargs)
+        finally:
+            sys.settrace(None)
+        calls.append(state["new"])
+
+    Gladiator.update = traced
+    try:
+        for _ in range(ticks):
+            match.step(1 / 60)
+    finally:
+        Gladiator.update = update
+    return sum(calls) / len(calls)
+
+# GLADIJATORI S PROSTORNOM MREŽOM, ISTA GUSTOĆA ZA SVAKI N
+class UpdateAllocationTest(unittest.TestCase):
+    def setUp(self):
+        self.screen = (settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT)
+        self.arena = (settings.ARENA_CENTER.copy(), settings.ARENA_RADIUS)
+
+    def tearDown(self):
+        settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT = self.screen
+        settings.ARENA_CENTER.update(self.arena[0])
+        settings.ARENA_RADIUS = self.arena[1]
+
+    def test_blocks_per_update_do_not_grow_with_count(self):
+        results = {count: blocks_per_update(count) for count in COUNTS}
+        for count, mean in results.items():
+            self.assertLessEqual(mean, BLOCKS_PER_UPDATE_LIMIT, f"N={count}: {results}")
+        self.assertLessEqual(max(results.values()) - min(results.values()), BLOCKS_PER_UPDATE_SPREAD, str(results))
+
+
+if __name__ == "__main__":
+    unittest.main()
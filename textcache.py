@@ -0,0 +1,62 @@
+from collections import OrderedDict
+import pygame
+
+# LRU SPREMNIK RENDERIRANIH TEKSTOVA
+class TextCache:
+    def __init__(self, capacity: int = 512):
+        self.capacity = capacity
+        self.surfaces: OrderedDict[tuple, pygame.Surface] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.surfaces)
+
+    def render(
+        self,
+        font: pygame.font.Font,
+        text: str,
+        color: tuple[int, int, int],
+        bold: bool = False,
+        antialias: bool = True,
+    ) -> pygame.Surface:
+        key = (font, text, color, bold, antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+        self.misses += 1
+        prev_bold = font.get_bold()
+        font.set_bold(bold)
+        surface = font.render(text, antialias, color)
+        font.set_bold(prev_bold)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.capacity:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self) -> None:
+        self.surfaces.clear()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self.surfaces),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+TEXT_CACHE = TextCache()
+
+
+def render_text(
+    font: pygame.font.Font,
+    text: str,
+    color: tuple[int, int, int],
+    bold: bool = False,
+) -> pygame.Surface:
+    return TEXT_CACHE.render(font, text, color, bold)
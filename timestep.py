@@ -0,0 +1,50 @@
+from __future__ import annotations
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Iterator
+
+if TYPE_CHECKING:
+    from match import Match
+
+# AKUMULATOR FIKSNOG KORAKA SIMULACIJE
+class FixedTimestep:
+    def __init__(self, rate: float, max_lag: float = 0.25, max_substeps: int = 8):
+        self.dt = 1.0 / rate
+        self.max_lag = max_lag
+        self.max_substeps = max_substeps
+        self.accumulator = 0.0
+
+    # BROJ KORAKA ZA OVAJ OKVIR; VIŠAK ZAOSTATKA SE ODBACUJE
+    def advance(self, frame_dt: float) -> int:
+        self.accumulator = min(self.accumulator + frame_dt, self.max_lag)
+        steps = min(int(self.accumulator / self.dt), self.max_substeps)
+        self.accumulator -= steps * self.dt
+        if steps == self.max_substeps:
+            self.accumulator = min(self.accumulator, self.dt)
+        return steps
+
+    @property
+    def alpha(self) -> float:
+        return min(1.0, self.accumulator / self.dt)
+
+    def reset(self) -> None:
+        self.accumulator = 0.0
+
+# PRIVREMENO INTERPOLIRANE POZICIJE ZA CRTANJE
+@contextmanager
+def interpolated(match: "Match", alpha: float) -> Iterator[None]:
+    if alpha >= 1.0:
+        yield
+        return
+    gladiators = match.gladiators
+    saved = [g.position for g in gladiators]
+    for g in gladiators:
+        g.position = g.prev_position.lerp(g.position, alpha)
+    pool = match.projectiles
+    real_pos = pool.pos
+    pool.pos = pool.prev_pos + (real_pos - pool.prev_pos) * alpha
+    try:
+        yield
+    finally:
+        for g, position in zip(gladiators, saved):
+            g.position = position
+        pool.pos = real_pos
@@ -0,0 +1,166 @@
+from __future__ import annotations
+import asyncio
+import logging
+import time
+
+TRANSPORT_XMPP = "xmpp"
+TRANSPORT_LOCAL = "local"
+
+logger = logging.getLogger(__name__)
+
+# PORUKA LOKALNE SABIRNICE (ISTA POLJA KOJA PONAŠANJA KORISTE IZ SPADE PORUKE)
+class LocalMessage:
+    __slots__ = ("to", "sender", "body", "metadata", "sent_at")
+
+    def __init__(self, to: str | None = None, sender: str | None = None, body: str | None = None, metadata: dict | None = None):
+        self.to = to
+        self.sender = sender
+        self.body = body
+        self.metadata = dict(metadata or {})
+        self.sent_at = 0.0
+
+    def set_metadata(self, key: str, value: str) -> None:
+        self.metadata[key] = value
+
+    def get_metadata(self, key: str) -> str | None:
+        return self.metadata.get(key)
+
+# SABIRNICA PORUKA UNUTAR PROCESA: JID -> AGENT
+class LocalBus:
+    def __init__(self):
+        self.agents: dict[str, LocalAgent] = {}
+        self.delivered = 0
+        self.dropped = 0
+        self.received = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    def register(self, agent: "LocalAgent") -> None:
+        self.agents[str(agent.jid)] = agent
+
+    def unregister(self, agent: "LocalAgent") -> None:
+        if self.agents.get(str(agent.jid)) is agent:
+            del self.agents[str(agent.jid)]
+
+    def deliver(self, msg: LocalMessage) -> None:
+        agent = self.agents.get(str(msg.to))
+        if agent is None:
+            self.dropped += 1
+            return
+        msg.sent_at = time.perf_counter()
+        self.delivered += 1
+        agent.dispatch(msg)
+
+    # VRIJEME OD SLANJA DO PREUZIMANJA U PONAŠANJU PRIMATELJA
+    def record_latency(self, msg: LocalMessage) -> None:
+        latency = time.perf_counter() - msg.sent_at
+        self.received += 1
+        self.latency_total += latency
+        self.latency_max = max(self.latency_max, latency)
+
+    def stats(self) -> dict:
+        return {
+            "agents": len(self.agents),
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "received": self.received,
+            "avg_latency": self.latency_total / self.received if self.received else 0.0,
+            "max_latency": self.latency_max,
+        }
+
+
+LOCAL_BUS = LocalBus()
+
+# CIKLIČKO PONAŠANJE S SEMANTIKOM spade.behaviour.CyclicBehaviour
+class LocalCyclicBehaviour:
+    def __init__(self):
+        self.agent: LocalAgent | None = None
+        self.queue: asyncio.Queue | None = None
+        self.task: asyncio.Task | None = None
+
+    def set_agent(self, agent: "LocalAgent") -> None:
+        self.agent = agent
+        self.queue = asyncio.Queue()
+
+    def start(self) -> None:
+        self.task = asyncio.get_running_loop().create_task(self._loop())
+
+    async def _loop(self) -> None:
+        try:
+            while True:
+                await self.run()
+        except asyncio.CancelledError:
+            pass
+        # NAMJERNO KAO CyclicBehaviour U SPADE-U: IZNIMKA SE ZAPISUJE S TRAGOM I ZAUSTAVLJA PONAŠANJE
+        except Exception:
+            logger.exception("exception running behaviour %s", self)
+
+    async def run(self) -> None:
+        raise NotImplementedError
+
+    def kill(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+
+    def is_killed(self) -> bool:
+        return self.task is None or self.task.done()
+
+    async def send(self, msg: LocalMessage) -> None:
+        msg.sender = str(self.agent.jid)
+        self.agent.bus.deliver(msg)
+
+    # BEZ TIMEOUTA VRAĆA ODMAH (None AKO JE RED PRAZAN), KAO U SPADE-U
+    async def receive(self, timeout: float | None = None) -> LocalMessage | None:
+        if timeout:
+            try:
+                msg = await asyncio.wait_for(self.queue.get(), timeout=timeout)
+            except asyncio.TimeoutError:
+                return None
+        else:
+            try:
+                msg = self.queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return None
+        self.agent.bus.record_latency(msg)
+        return msg
+
+# AGENT LOKALNE SABIRNICE S SUČELJEM KOJE KORISTI agents.py
+class LocalAgent:
+    def __init__(self, jid: str, password: str, bus: LocalBus | None = None):
+        self.jid = jid
+        self.password = password
+        self.bus = bus if bus is not None else LOCAL_BUS
+        self.behaviours: list[LocalCyclicBehaviour] = []
+        self.running = False
+
+    async def setup(self) -> None:
+        pass
+
+    def add_behaviour(self, behaviour: LocalCyclicBehaviour) -> None:
+        behaviour.set_agent(self)
+        self.behaviours.append(behaviour)
+        if self.running:
+            behaviour.start()
+
+    async def start(self) -> None:
+        self.bus.register(self)
+        await self.setup()
+        self.running = True
+        for behaviour in self.behaviours:
+            behaviour.start()
+
+    async def stop(self) -> None:
+        self.running = False
+        self.bus.unregister(self)
+        for behaviour in self.behaviours:
+            behaviour.kill()
+        tasks = [b.task for b in self.behaviours if b.task is not None]
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def is_alive(self) -> bool:
+        return self.running
+
+    # SVAKO PONAŠANJE DOBIVA SVOJU KOPIJU REDA, KAO Agent.dispatch U SPADE-U
+    def dispatch(self, msg: LocalMessage) -> None:
+        for behaviour in self.behaviours:
+            behaviour.queue.put_nowait(msg)